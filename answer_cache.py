@@ -0,0 +1,75 @@
+import os
+import re
+import atexit
+
+from ttl_cache import TTLCache, CACHE_DIR
+
+# Questions about what is happening now go stale quickly; history doesn't
+RECENT_TTL = int(os.getenv("SPORTSCHAT_ANSWER_RECENT_TTL", str(30 * 60)))
+DEFAULT_TTL = int(os.getenv("SPORTSCHAT_ANSWER_TTL", str(24 * 3600)))
+HISTORICAL_TTL = int(os.getenv("SPORTSCHAT_ANSWER_HISTORICAL_TTL", str(30 * 24 * 3600)))
+
+# Checked before HISTORICAL_WORDS: "the most wins this season" is about now
+RECENT_WORDS = {
+    "latest", "recent", "recently", "current", "currently", "today", "tonight", "yesterday",
+    "now", "upcoming", "next", "live", "score", "scores", "standings", "injured", "injury",
+    "season", "this", "last", "night", "week", "weekend", "year", "playoffs", "tomorrow",
+}
+HISTORICAL_WORDS = {
+    "history", "historical", "ever", "all", "time", "most", "record", "records", "greatest",
+    "first", "legend", "legendary", "career", "founded", "championships", "titles", "rings",
+}
+
+# Tense-bearing verbs ("is"/"was", "has"/"had") are kept: they change the answer
+STOP_WORDS = {
+    "a", "an", "the", "be",
+    "of", "in", "on", "at", "to", "for", "from", "by", "with", "about", "me", "tell",
+    "please", "can", "you", "could", "would", "what", "whats", "who", "whos", "which",
+    "and", "or", "s",
+}
+
+answer_cache = TTLCache(
+    max_entries=int(os.getenv("SPORTSCHAT_ANSWER_CACHE_MAX_ENTRIES", "500")),
+    max_bytes=16 * 1024 * 1024,
+    default_ttl=DEFAULT_TTL,
+    path=os.path.join(CACHE_DIR, "llm_answers.json"),
+    save_interval=10,
+)
+atexit.register(answer_cache.flush)
+
+
+def _words(question):
+    return re.sub(r"[^a-z0-9\s]", " ", question.lower().replace("'", "")).split()
+
+
+def normalize_question(question):
+    """Fold case, punctuation, whitespace and stop words so rephrasings share a key"""
+    words = [word for word in _words(question) if word not in STOP_WORDS]
+    return " ".join(words) if words else " ".join(_words(question))
+
+
+def question_ttl(question):
+    """Pick a TTL for an answer based on whether the question is about now or history"""
+    words = set(_words(question))
+    if words & RECENT_WORDS:
+        return RECENT_TTL
+    if words & HISTORICAL_WORDS or any(re.fullmatch(r"(18|19|20)\d\d", word) for word in words):
+        return HISTORICAL_TTL
+    return DEFAULT_TTL
+
+
+def get_answer(question):
+    """Return a cached answer for the question, or None"""
+    key = normalize_question(question)
+    return answer_cache.get(key) if key else None
+
+
+def store_answer(question, answer):
+    key = normalize_question(question)
+    if key and answer:
+        answer_cache.set(key, answer, ttl=question_ttl(question))
+
+
+def get_stats():
+    """Return hit/miss/eviction counters for cached answers"""
+    return answer_cache.get_stats()
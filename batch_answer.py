@@ -0,0 +1,93 @@
+"""Answer many general sports questions non-interactively.
+
+Reads one question per line from a file (or stdin with "-"), answers them
+through the same pipeline as generate_general_sports_response (exact and
+semantic answer caches, then the LLM), and writes one JSON object per line
+with the answer and its latency as each question completes.
+
+Usage: python batch_answer.py questions.txt [--concurrency 4] [--output answers.jsonl]
+"""
+import sys
+import json
+import time
+import argparse
+
+import main as sports_app
+import answer_cache
+from llm_client import batch_llm
+
+
+def read_questions(source):
+    """Read non-empty, non-comment lines from a file path or "-" for stdin"""
+    f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def answer_questions(questions, concurrency=4):
+    """Yield a result dict per question as it completes (cache hits first)"""
+    pending = []
+    for index, question in enumerate(questions):
+        lookup_started = time.time()
+        cached, vector = sports_app.lookup_cached_answer(question)
+        if cached is not None:
+            yield {
+                "index": index,
+                "question": question,
+                "answer": cached,
+                "source": "cache",
+                "latency_ms": round((time.time() - lookup_started) * 1000, 1),
+            }
+        else:
+            pending.append((index, question, vector))
+
+    if not pending:
+        return
+
+    # Questions that normalise to the same key are only generated once
+    groups = {}
+    for index, question, vector in pending:
+        key = answer_cache.normalize_question(question)
+        groups.setdefault(key, []).append((index, question, vector))
+    batches = list(groups.values())
+
+    # Cache misses go to the LLM through the shared job queue, at most `concurrency`
+    # at a time; each answer's latency runs from its job being queued to finishing
+    prompts = [sports_app.build_general_sports_prompt(group[0][1]) for group in batches]
+    for position, result, timings in batch_llm(prompts, max_concurrency=concurrency):
+        for index, question, vector in batches[position]:
+            item = {"index": index, "question": question, "source": "llm"}
+            item.update(timings)
+            if isinstance(result, Exception):
+                item["answer"] = None
+                item["error"] = f"{type(result).__name__}: {result}"
+            else:
+                item["answer"] = result
+                sports_app.store_answer(question, result, vector)
+            yield item
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help='file with one question per line, or "-" for stdin')
+    parser.add_argument("--concurrency", type=int, default=4, help="max questions in flight at once (default 4); generation is also capped by SPORTSCHAT_LLM_WORKERS")
+    parser.add_argument("--output", help="write JSON Lines here instead of stdout")
+    args = parser.parse_args()
+
+    questions = read_questions(args.input)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.time()
+    errors = 0
+    try:
+        for item in answer_questions(questions, args.concurrency):
+            errors += "error" in item
+            out.write(json.dumps(item) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Answered {len(questions) - errors}/{len(questions)} questions in {time.time() - started:.1f}s", file=sys.stderr)
@@ -0,0 +1,268 @@
+"""Benchmark team-name resolution, logo resolution and end-to-end query latency.
+
+Runs entirely offline: TheSportsDB responses are replayed from recorded
+fixtures (see http_replay.py) and the LLM is the deterministic fake_ollama
+server, so numbers are comparable across commits. Every benchmark reports
+p50/p95/p99 latency and, where upstream calls are involved, how many HTTP
+requests each query made. Caches are emptied before each cold query.
+
+Usage: python bench_queries.py [--iterations 3] [--latency-ms 0] [--tokens-per-second 0]
+                               [--teams "Arsenal" ...] [--json] [--output FILE]
+Record the fixtures first: python http_replay.py record "Arsenal" "Los Angeles Lakers" "Kansas City Chiefs"
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+DEFAULT_TEAMS = ["Arsenal", "Los Angeles Lakers", "Kansas City Chiefs"]
+INFO_TYPES = ["all", "basic", "results", "fixtures", "standings"]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies, upstream_calls=None, errors=0):
+    """Latency percentiles in ms, plus upstream requests per query when counted"""
+    values = sorted(latencies)
+    total = sum(values)
+    summary = {
+        "count": len(values),
+        "errors": errors,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "mean_ms": round(total / len(values) * 1000, 3) if values else 0.0,
+        "per_second": round(len(values) / total, 1) if total else 0.0,
+    }
+    if upstream_calls is not None:
+        summary["upstream_calls_per_query"] = round(sum(upstream_calls) / len(upstream_calls), 2) if upstream_calls else 0.0
+        summary["upstream_calls_max"] = max(upstream_calls, default=0)
+    return summary
+
+
+def upstream_count():
+    import http_replay
+
+    stats = http_replay.get_stats()
+    return stats["replayed"] + stats["missing"]
+
+
+def reset_caches():
+    """Forget everything cached in memory so the next query starts cold"""
+    import main
+    import team_store
+    import logo_store
+    import logo_probe
+    import answer_cache
+    import sports_db
+
+    main.sportsdb_cache.clear()
+    sports_db.clear()
+    team_store.clear()
+    logo_store._store.clear()
+    logo_probe.dead_urls.clear()
+    answer_cache.answer_cache.clear()
+    main.find_team_logo.cache_clear()
+
+
+def prefetched_caches():
+    """Cold caches except for the league prefetch, as after a restart with the prefetch done"""
+    import main
+
+    reset_caches()
+    main.prefetch_leagues()
+
+
+def timed_queries(fn, args_list, iterations, cold, setup=None):
+    latencies, upstream, errors = [], [], 0
+    if cold:
+        setup = setup or reset_caches
+    else:
+        # One untimed pass fills the caches
+        for args in args_list:
+            try:
+                fn(*args)
+            except Exception:
+                pass
+    for _ in range(iterations):
+        for args in args_list:
+            if setup:
+                setup()
+            calls_before = upstream_count()
+            started = time.perf_counter()
+            try:
+                fn(*args)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+            upstream.append(upstream_count() - calls_before)
+    return summarize(latencies, upstream, errors)
+
+
+def bench_logo_names(iterations):
+    """find_team_logo over every team name and alias in the logo tables, cold and warm"""
+    from team_logos import LEAGUE_LOGOS, LEAGUE_ALIASES, find_team_logo
+
+    lookups = []
+    for league, teams in LEAGUE_LOGOS.items():
+        lookups.extend((name, league) for name in teams)
+        lookups.extend((name, league) for name in LEAGUE_ALIASES.get(league, {}))
+    # Without a league hint, and with display-style capitalisation
+    lookups.extend((name.title(), None) for name, _ in list(lookups))
+
+    results = {"names": len(lookups)}
+    for label, clear in (("cold", True), ("warm", False)):
+        latencies = []
+        if not clear:
+            for name, league in lookups:
+                find_team_logo(name, league)
+        for _ in range(iterations):
+            for name, league in lookups:
+                if clear:
+                    find_team_logo.cache_clear()
+                started = time.perf_counter()
+                find_team_logo(name, league)
+                latencies.append(time.perf_counter() - started)
+        results[label] = summarize(latencies)
+    return results
+
+
+def bench_team_resolution(teams, iterations):
+    import main
+
+    return {
+        "get_team_details": timed_queries(main.get_team_details, [(team,) for team in teams], iterations, cold=True),
+        "advanced_team_search": timed_queries(main.advanced_team_search, [(team,) for team in teams], iterations, cold=True),
+        "get_team_details_warm": timed_queries(main.get_team_details, [(team,) for team in teams], iterations, cold=False),
+        "get_team_details_prefetched": timed_queries(
+            main.get_team_details, [(team,) for team in teams], iterations, cold=True, setup=prefetched_caches
+        ),
+    }
+
+
+def bench_end_to_end(teams, iterations):
+    import main
+
+    results = {}
+    for info_type in INFO_TYPES:
+        queries = [(team, info_type) for team in teams]
+        results[info_type] = {
+            "cold": timed_queries(main.generate_response, queries, iterations, cold=True),
+            "warm": timed_queries(main.generate_response, queries, iterations, cold=False),
+        }
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    # Must be in place before the app modules read their settings at import time
+    os.environ["SPORTSCHAT_HTTP_MODE"] = "replay"
+    os.environ["SPORTSCHAT_CACHE_DIR"] = tempfile.mkdtemp(prefix="sportschat-bench-")
+    os.environ["SPORTSCHAT_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["SPORTSCHAT_LLM_WARMUP"] = "0"
+    os.environ["SPORTSCHAT_SEMANTIC_CACHE"] = "0"
+
+    from fake_ollama import start_fake_ollama
+
+    server, url = start_fake_ollama(tokens_per_second=args.tokens_per_second, first_token_ms=args.first_token_ms)
+    os.environ["OLLAMA_HOST"] = url
+
+    import main
+    import http_replay
+
+    # Pay for lazy imports and creating the LLM client outside the timings
+    try:
+        main.generate_response(args.teams[0], "all")
+    except Exception:
+        pass
+    reset_caches()
+    replay_before = http_replay.get_stats()
+
+    report = {
+        "python": sys.version.split()[0],
+        "commit": git_commit(),
+        "config": {
+            "iterations": args.iterations,
+            "teams": args.teams,
+            "replay_latency_ms": args.latency_ms,
+            "llm_tokens_per_second": args.tokens_per_second,
+            "llm_first_token_ms": args.first_token_ms,
+            "fixture_dir": http_replay.FIXTURE_DIR,
+        },
+        "benchmarks": {
+            "logo_names": bench_logo_names(args.iterations),
+            "team_resolution": bench_team_resolution(args.teams, args.iterations),
+            "end_to_end": bench_end_to_end(args.teams, args.iterations),
+        },
+        "replay": {key: value - replay_before[key] if isinstance(value, int) else value
+                   for key, value in http_replay.get_stats().items()},
+        "llm_generations": server.stats["generations"],
+    }
+    server.shutdown()
+    return report
+
+
+def print_summary(name, summary):
+    line = f"  {name:<28} p50 {summary['p50_ms']:9.3f} ms  p95 {summary['p95_ms']:9.3f} ms  p99 {summary['p99_ms']:9.3f} ms"
+    if "upstream_calls_per_query" in summary:
+        line += f"  {summary['upstream_calls_per_query']:5.2f} upstream/query"
+    if summary["errors"]:
+        line += f"  {summary['errors']} errors"
+    print(line)
+
+
+def print_report(report):
+    benchmarks = report["benchmarks"]
+    logos = benchmarks["logo_names"]
+    print(f"find_team_logo ({logos['names']} names):")
+    for label in ("cold", "warm"):
+        print_summary(label, logos[label])
+        print(f"  {'':<28} {logos[label]['per_second']:,.0f} lookups/s")
+    print("Team resolution:")
+    for name, summary in benchmarks["team_resolution"].items():
+        print_summary(name, summary)
+    print("generate_response:")
+    for info_type, runs in benchmarks["end_to_end"].items():
+        for label, summary in runs.items():
+            print_summary(f"{info_type} ({label})", summary)
+    replay = report["replay"]
+    if replay["missing"]:
+        print(f"! {replay['missing']} requests had no recorded fixture; record them with http_replay.py first")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=3, help="passes over the query set per benchmark")
+    parser.add_argument("--teams", nargs="+", default=DEFAULT_TEAMS, help="team queries to run (need recorded fixtures)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated upstream latency per replayed request")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="fake LLM speed; 0 answers instantly")
+    parser.add_argument("--first-token-ms", type=float, default=0, help="fake LLM delay before the first token")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
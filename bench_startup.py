@@ -0,0 +1,107 @@
+"""Measure import-time cost of the app's entry modules and flag startup regressions.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each entry module (best of several runs), compares the cumulative cost with
+its budget and checks that heavy dependencies stay off the startup path.
+
+Usage: python bench_startup.py [--runs 5] [--json] [--output FILE]
+Exits with status 1 if any module is over budget.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Cumulative import budget per entry module, in milliseconds
+BUDGETS_MS = {
+    "main": 250,
+    # Importing streamlit_app outside `streamlit run` executes the page in bare mode,
+    # so this includes streamlit itself and rendering the static UI
+    "streamlit_app": 3000,
+}
+
+# Modules that must only be imported on first use, never while importing main
+DEFERRED_MODULES = ["langchain", "langchain_core", "langchain_ollama", "ollama", "requests", "urllib3", "numpy", "PIL"]
+
+TOP_N = 10
+
+
+def measure(module):
+    """Import a module in a fresh interpreter and return (cumulative_ms, {imported module: self_ms})"""
+    env = dict(os.environ, SPORTSCHAT_LLM_WARMUP="0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_ms = None
+    self_costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        self_costs[name] = self_costs.get(name, 0) + int(self_us) / 1000
+        if name == module:
+            cumulative_ms = int(cumulative_us) / 1000
+    return cumulative_ms, self_costs
+
+
+def run(runs):
+    report = {"python": sys.version.split()[0], "runs": runs, "modules": {}, "ok": True}
+    for module, budget_ms in BUDGETS_MS.items():
+        best = None
+        for _ in range(runs):
+            cumulative_ms, self_costs = measure(module)
+            if best is None or cumulative_ms < best[0]:
+                best = (cumulative_ms, self_costs)
+        cumulative_ms, self_costs = best
+
+        heaviest = sorted(self_costs.items(), key=lambda item: item[1], reverse=True)[:TOP_N]
+        entry = {
+            "cumulative_ms": round(cumulative_ms, 1),
+            "budget_ms": budget_ms,
+            "over_budget": cumulative_ms > budget_ms,
+            "heaviest_imports_ms": {name: round(ms, 1) for name, ms in heaviest},
+        }
+        if module == "main":
+            entry["deferred_modules_imported"] = [name for name in DEFERRED_MODULES if name in self_costs]
+            if entry["deferred_modules_imported"]:
+                entry["over_budget"] = True
+        report["modules"][module] = entry
+        report["ok"] = report["ok"] and not entry["over_budget"]
+    return report
+
+
+def print_report(report):
+    for module, entry in report["modules"].items():
+        status = "OVER BUDGET" if entry["over_budget"] else "ok"
+        print(f"{module}: {entry['cumulative_ms']:.1f} ms (budget {entry['budget_ms']} ms) {status}")
+        for name in entry.get("deferred_modules_imported", []):
+            print(f"  ! {name} is imported at startup but should be deferred")
+        for name, ms in entry["heaviest_imports_ms"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="imports per module; the fastest is kept")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if report["ok"] else 1)
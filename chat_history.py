@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import uuid
+import threading
+from itertools import islice
+from ttl_cache import CACHE_DIR
+
+# Messages kept in memory per session; older ones are paged out to disk
+MAX_IN_MEMORY = int(os.getenv("SPORTSCHAT_CHAT_HISTORY_LIMIT", "40"))
+HISTORY_DIR = os.path.join(CACHE_DIR, "chat_history")
+MAX_FILE_AGE = 7 * 24 * 3600   # Paged-out history of sessions idle this long is deleted
+
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+def prune_history_files(directory=HISTORY_DIR, max_age=MAX_FILE_AGE):
+    """Delete paged-out histories of sessions that have been idle for max_age seconds"""
+    cutoff = time.time() - max_age
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class ChatHistory:
+    """A session's chat messages with only the most recent max_messages kept in memory
+
+    Older messages are appended to a per-session JSON-lines file and read back
+    on demand with page(), so memory stays bounded however long the session.
+    Messages are addressed by their position in the whole conversation.
+    """
+
+    def __init__(self, max_messages=MAX_IN_MEMORY, directory=HISTORY_DIR):
+        global _pruned
+        with _prune_lock:
+            if not _pruned:
+                _pruned = True
+                prune_history_files(directory)
+        self.max_messages = max_messages
+        self.path = os.path.join(directory, f"{uuid.uuid4().hex}.jsonl")
+        self.messages = []      # In memory, oldest first
+        self.paged_out = 0      # Messages before self.messages, stored in self.path
+
+    def __len__(self):
+        return self.paged_out + len(self.messages)
+
+    def append(self, message):
+        self.messages.append(message)
+        if len(self.messages) > self.max_messages:
+            self._page_out(len(self.messages) - self.max_messages)
+
+    def _page_out(self, count):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for message in self.messages[:count]:
+                f.write(json.dumps(message) + "\n")
+        del self.messages[:count]
+        self.paged_out += count
+
+    def page(self, start, stop):
+        """Messages [start, stop) of the whole conversation, reading paged-out ones from disk"""
+        start, stop = max(0, start), min(stop, len(self))
+        if start >= stop:
+            return []
+        older = []
+        if start < self.paged_out:
+            with open(self.path, encoding="utf-8") as f:
+                older = [json.loads(line) for line in islice(f, start, min(stop, self.paged_out))]
+        return older + self.messages[max(0, start - self.paged_out):max(0, stop - self.paged_out)]
+
+    def tail(self, count):
+        """The last count messages"""
+        return self.page(len(self) - count, len(self))
+
+    def clear(self):
+        self.messages = []
+        self.paged_out = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,184 @@
+"""A stand-in Ollama server with deterministic output for offline benchmarks.
+
+Speaks enough of the Ollama HTTP API for SportsChat: /api/generate (streamed
+or not, including the empty-prompt model load used for warm-up), /api/embed
+and /api/embeddings (hash-based bag-of-words vectors, so paraphrases land
+close together), /api/tags and /api/version. Answers are built from canned
+sentences chosen by a hash of the prompt, so the same prompt always gets the
+same answer, and are streamed at a configurable token rate.
+
+Usage: python fake_ollama.py [--port 11435] [--tokens-per-second 40] [--first-token-ms 200]
+then run the app or a benchmark with OLLAMA_HOST=http://127.0.0.1:11435
+"""
+import re
+import json
+import time
+import zlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_SENTENCES = [
+    "What a question, sports fans!",
+    "Let's take a look at the record books.",
+    "This one goes all the way back through the history of the game.",
+    "The numbers tell an incredible story of consistency and clutch performances.",
+    "Fans will remember those championship runs for generations.",
+    "It's been a season full of twists, upsets and late drama.",
+    "The rivalry only adds fuel to an already blazing fire.",
+    "Coaches, players and the fans all played their part in this one.",
+    "And that's the kind of moment that makes sports so special!",
+]
+EMBEDDING_DIM = 64
+
+
+def canned_answer(prompt, tokens):
+    """Deterministic answer of about `tokens` words for a prompt"""
+    seed = zlib.crc32(prompt.encode("utf-8"))
+    words = []
+    index = seed
+    while len(words) < tokens:
+        words.extend(CANNED_SENTENCES[index % len(CANNED_SENTENCES)].split())
+        index = index * 31 + 7
+    return words[:tokens]
+
+
+def fake_embedding(text):
+    """Hash each word into a fixed-size vector; similar questions share most dimensions"""
+    vector = [0.0] * EMBEDDING_DIM
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        vector[zlib.crc32(word.encode("utf-8")) % EMBEDDING_DIM] += 1.0
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+    # Set on the server: tokens_per_second, first_token_ms, answer_tokens, stats
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": "llama3.2:latest", "model": "llama3.2:latest"}]})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        request = self._read_json()
+        if self.path == "/api/generate":
+            self._generate(request)
+        elif self.path == "/api/embed":
+            inputs = request.get("input", "")
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            self.server.stats["embeddings"] += len(inputs)
+            self._send_json({"model": request.get("model", ""), "embeddings": [fake_embedding(text) for text in inputs]})
+        elif self.path == "/api/embeddings":
+            self.server.stats["embeddings"] += 1
+            self._send_json({"embedding": fake_embedding(request.get("prompt", ""))})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _chunk(self, model, text, done, **extra):
+        payload = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": text,
+            "done": done,
+        }
+        payload.update(extra)
+        return payload
+
+    def _generate(self, request):
+        model = request.get("model", "llama3.2")
+        prompt = request.get("prompt") or ""
+        stream = request.get("stream", True)
+        started = time.perf_counter()
+
+        # An empty prompt just "loads" the model (used by the warm-up request)
+        if not prompt:
+            self.server.stats["loads"] += 1
+            self._send_json(self._chunk(model, "", True, done_reason="load"))
+            return
+
+        self.server.stats["generations"] += 1
+        words = canned_answer(prompt, self.server.answer_tokens)
+        delay = 1 / self.server.tokens_per_second if self.server.tokens_per_second > 0 else 0
+        final = dict(
+            done_reason="stop",
+            prompt_eval_count=len(prompt.split()),
+            eval_count=len(words),
+        )
+
+        if not stream:
+            time.sleep(self.server.first_token_ms / 1000 + delay * len(words))
+            final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+            self._send_json(self._chunk(model, " ".join(words), True, **final))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(self.server.first_token_ms / 1000)
+        try:
+            for position, word in enumerate(words):
+                text = word if position == 0 else " " + word
+                self._write_chunk(self._chunk(model, text, False))
+                time.sleep(delay)
+            final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+            self._write_chunk(self._chunk(model, "", True, **final))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.stats["disconnects"] += 1
+
+    def _write_chunk(self, payload):
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_fake_ollama(port=0, tokens_per_second=40.0, first_token_ms=200.0, answer_tokens=60):
+    """Start the server on a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOllamaHandler)
+    server.daemon_threads = True
+    server.tokens_per_second = tokens_per_second
+    server.first_token_ms = first_token_ms
+    server.answer_tokens = answer_tokens
+    server.stats = {"generations": 0, "loads": 0, "embeddings": 0, "disconnects": 0}
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--tokens-per-second", type=float, default=40.0, help="0 streams as fast as possible")
+    parser.add_argument("--first-token-ms", type=float, default=200.0, help="delay before the first token")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="words per answer")
+    args = parser.parse_args()
+
+    server, url = start_fake_ollama(args.port, args.tokens_per_second, args.first_token_ms, args.answer_tokens)
+    print(f"Fake Ollama listening on {url} (set OLLAMA_HOST={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
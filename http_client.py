@@ -0,0 +1,167 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import tracing
+
+# Pool and timeout settings (override in .env if needed)
+POOL_CONNECTIONS = int(os.getenv("SPORTSCHAT_POOL_CONNECTIONS", "10"))  # Number of hosts to keep pools for
+POOL_MAXSIZE = int(os.getenv("SPORTSCHAT_POOL_MAXSIZE", "10"))  # Max open connections per host
+CONNECT_TIMEOUT = float(os.getenv("SPORTSCHAT_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("SPORTSCHAT_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("SPORTSCHAT_MAX_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.getenv("SPORTSCHAT_BACKOFF_FACTOR", "0.3"))
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+_session = None
+_probe_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+
+def _new_session(retries):
+    # requests/urllib3 are imported here to keep them off the app's startup path
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    import http_replay
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+    )
+    # SPORTSCHAT_HTTP_MODE=record/replay swaps in the fixture adapters from http_replay
+    adapter_class = http_replay.get_adapter_class() or HTTPAdapter
+    adapter = adapter_class(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry if retries else 0,
+        pool_block=False,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared keep-alive session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session(MAX_RETRIES)
+    return _session
+
+
+def get_probe_session():
+    """Return the keep-alive session for probes, which never retries so a dead host costs one timeout"""
+    global _probe_session
+    if _probe_session is None:
+        with _session_lock:
+            if _probe_session is None:
+                _probe_session = _new_session(0)
+    return _probe_session
+
+
+def request(method, url, timeout=None, retries=True, **kwargs):
+    """Send a request through the shared pool with explicit connect/read timeouts
+
+    retries=False uses the probe session, which gives up after the first failure.
+    """
+    session = get_session() if retries else get_probe_session()
+    import requests
+
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["in_flight"] += 1
+        _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    parts = urlsplit(url)
+    try:
+        with tracing.span("http", endpoint_label(method, url), host=parts.netloc, params=kwargs.get("params")) as span:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+            span["status"] = response.status_code
+            if not kwargs.get("stream"):
+                span["bytes"] = len(response.content)
+            return response
+    except requests.RequestException:
+        with _stats_lock:
+            _stats["errors"] += 1
+        raise
+    finally:
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+
+
+def endpoint_label(method, url):
+    """Short, low-cardinality name for a request: the API script for TheSportsDB, else the host"""
+    parts = urlsplit(url)
+    script = parts.path.rsplit("/", 1)[-1]
+    if script.endswith(".php"):
+        return f"{method} {script}"
+    return f"{method} {parts.netloc}"
+
+
+def get(url, **kwargs):
+    """GET through the shared pool"""
+    return request("GET", url, **kwargs)
+
+
+def head(url, **kwargs):
+    """HEAD through the shared pool"""
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", url, **kwargs)
+
+
+def get_pool_stats():
+    """Return request counts, in-flight count and connection reuse ratio"""
+    with _stats_lock:
+        stats = dict(_stats)
+
+    # urllib3 tracks how many connections each host pool opened vs requests it served
+    connections_opened = 0
+    pool_requests = 0
+    hosts = []
+    for session in (_session, _probe_session):
+        if session is None:
+            continue
+        for adapter in set(session.adapters.values()):
+            poolmanager = getattr(adapter, "poolmanager", None)
+            if poolmanager is None:
+                continue  # e.g. http_replay's ReplayAdapter, which never opens connections
+            pools = poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                connections_opened += pool.num_connections
+                pool_requests += pool.num_requests
+                hosts.append(pool.host)
+
+    stats["connections_opened"] = connections_opened
+    stats["pool_requests"] = pool_requests
+    stats["hosts"] = sorted(set(hosts))
+    if pool_requests:
+        stats["reuse_ratio"] = round(1 - connections_opened / pool_requests, 3)
+    else:
+        stats["reuse_ratio"] = 0.0
+    return stats
+
+
+def close():
+    """Close all pooled connections"""
+    global _session, _probe_session
+    with _session_lock:
+        for session in (_session, _probe_session):
+            if session is not None:
+                session.close()
+        _session = _probe_session = None
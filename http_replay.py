@@ -0,0 +1,184 @@
+"""Record and replay upstream HTTP traffic for offline tests and benchmarks.
+
+Set SPORTSCHAT_HTTP_MODE before starting the app (or a test/benchmark):
+
+    live    - normal behaviour (default)
+    record  - make real requests and save every response as a fixture file
+    replay  - serve responses from fixture files only, never touching the network
+
+Fixtures are JSON files in SPORTSCHAT_FIXTURE_DIR (default fixtures/http). The
+TheSportsDB API key is redacted from recorded URLs, so fixtures recorded with
+one key replay with any other. In replay mode SPORTSCHAT_REPLAY_LATENCY_MS
+(plus up to SPORTSCHAT_REPLAY_JITTER_MS of deterministic jitter) is slept
+before each response to approximate real upstream latency.
+
+To record fixtures for every endpoint main.py uses:
+
+    python http_replay.py record "Arsenal" "Los Angeles Lakers" "Kansas City Chiefs"
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+HTTP_MODE = os.getenv("SPORTSCHAT_HTTP_MODE", "live").lower()
+FIXTURE_DIR = os.getenv("SPORTSCHAT_FIXTURE_DIR", os.path.join("fixtures", "http"))
+REPLAY_LATENCY_MS = float(os.getenv("SPORTSCHAT_REPLAY_LATENCY_MS", "0"))
+REPLAY_JITTER_MS = float(os.getenv("SPORTSCHAT_REPLAY_JITTER_MS", "0"))
+
+API_KEY_PLACEHOLDER = "{API_KEY}"
+
+_stats_lock = threading.Lock()
+_stats = {"recorded": 0, "replayed": 0, "missing": 0}
+
+
+def fixture_key(method, url):
+    """Normalise a request into a stable key: method, redacted path and sorted query"""
+    parts = urlsplit(url)
+    path_parts = parts.path.split("/")
+    # TheSportsDB puts the key right after /api/v1/json/
+    if len(path_parts) > 5 and path_parts[1:4] == ["api", "v1", "json"]:
+        path_parts[4] = API_KEY_PLACEHOLDER
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.scheme}://{parts.netloc}{'/'.join(path_parts)}"
+    return f"{key}?{query}" if query else key
+
+
+def fixture_path(key, fixture_dir=None):
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = key.split(" ", 1)[1].split("://", 1)[-1].split("?")[0].rsplit("/", 1)[-1] or "index"
+    slug = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)[:40]
+    return os.path.join(fixture_dir or FIXTURE_DIR, f"{slug}-{digest}.json")
+
+
+def save_fixture(method, url, status, headers, body, fixture_dir=None):
+    key = fixture_key(method, url)
+    path = fixture_path(key, fixture_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fixture = {
+        "key": key,
+        "status": status,
+        "headers": {name: value for name, value in headers.items() if name.lower() in ("content-type", "location")},
+        "body": body.decode("latin-1"),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=1)
+    with _stats_lock:
+        _stats["recorded"] += 1
+    return path
+
+
+def load_fixture(method, url, fixture_dir=None):
+    """Return the recorded fixture for a request, or None"""
+    key = fixture_key(method, url)
+    try:
+        with open(fixture_path(key, fixture_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _replay_delay(key):
+    if not REPLAY_LATENCY_MS and not REPLAY_JITTER_MS:
+        return 0.0
+    # Jitter derived from the key, so the same run is reproducible
+    fraction = int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return (REPLAY_LATENCY_MS + REPLAY_JITTER_MS * fraction) / 1000
+
+
+def get_adapter_class(mode=None, fixture_dir=None):
+    """Return the transport adapter class for the mode, or None for live traffic"""
+    from requests.adapters import BaseAdapter, HTTPAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+
+    mode = (mode or HTTP_MODE).lower()
+
+    class RecordingAdapter(HTTPAdapter):
+        """Sends requests for real and saves each response as a fixture"""
+
+        def send(self, request, **kwargs):
+            response = super().send(request, **kwargs)
+            save_fixture(request.method, request.url, response.status_code, response.headers, response.content, fixture_dir)
+            return response
+
+    class ReplayAdapter(BaseAdapter):
+        """Answers requests from fixtures; unknown requests get a 404 marked X-Replay-Missing"""
+
+        def __init__(self, **kwargs):
+            # Accepts (and ignores) the pool/retry settings given to HTTPAdapter
+            super().__init__()
+
+        def send(self, request, **kwargs):
+            fixture = load_fixture(request.method, request.url, fixture_dir)
+            response = Response()
+            response.request = request
+            response.url = request.url
+            response.reason = "Replayed"
+            if fixture is None:
+                with _stats_lock:
+                    _stats["missing"] += 1
+                response.status_code = 404
+                response.headers = CaseInsensitiveDict({"X-Replay-Missing": "1"})
+                response._content = b""
+                return response
+
+            delay = _replay_delay(fixture["key"])
+            if delay:
+                time.sleep(delay)
+            with _stats_lock:
+                _stats["replayed"] += 1
+            response.status_code = fixture["status"]
+            response.headers = CaseInsensitiveDict(fixture["headers"])
+            response._content = fixture["body"].encode("latin-1")
+            response.encoding = "utf-8"
+            return response
+
+        def close(self):
+            pass
+
+    if mode == "record":
+        return RecordingAdapter
+    if mode == "replay":
+        return ReplayAdapter
+    return None
+
+
+def get_stats():
+    """Return recorded/replayed/missing counts"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["mode"] = HTTP_MODE
+    return stats
+
+
+def record_teams(team_names):
+    """Run the full data flow for each team so every endpoint it touches gets a fixture"""
+    import main as sports_app
+
+    for team_name in team_names:
+        snapshot = sports_app.get_team_snapshot(team_name, "all")
+        found = snapshot["team_info"]["team"] if snapshot else "not found"
+        print(f"{team_name}: {found}")
+    # After the searches, so both the search and the prefetched resolution paths get fixtures
+    print(f"League prefetch: {sports_app.prefetch_leagues()}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "record":
+        print(__doc__)
+        sys.exit(1)
+    if HTTP_MODE != "record":
+        # Re-run with the mode set so http_client picks it up at import time, and with
+        # empty caches so every request really goes upstream and gets recorded
+        os.environ["SPORTSCHAT_HTTP_MODE"] = "record"
+        os.environ["SPORTSCHAT_CACHE_DIR"] = tempfile.mkdtemp(prefix="sportschat-record-")
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+    record_teams(sys.argv[2:])
+    print(f"Recorded {get_stats()['recorded']} responses into {FIXTURE_DIR}")
@@ -0,0 +1,93 @@
+import time
+import threading
+from collections import deque
+
+MAX_DELTAS = 500     # Deltas kept for clients catching up; older clients get a full snapshot
+SCORE_FIELDS = ("home_score", "away_score", "status")
+
+
+class LiveScoreFeed:
+    """Diffs successive snapshots of live events and publishes only what changed
+
+    snapshot() returns {event_id: event} for the events worth showing (e.g.
+    matches in or near play). Each poll() compares it with the previous
+    snapshot and appends numbered deltas: "new" and "removed" events, "score"
+    changes and "status" changes. Clients remember the last sequence number
+    they applied and call since(seq) to get just the deltas after it.
+    """
+
+    def __init__(self, snapshot, max_deltas=MAX_DELTAS):
+        self.snapshot = snapshot
+        self._events = {}
+        self._deltas = deque(maxlen=max_deltas)
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Polls run from the refresher and from inline first syncs; one at a time, so an
+        # older snapshot is never applied after a newer one
+        self._poll_lock = threading.Lock()
+        self.stats = {"polls": 0, "deltas": 0, "errors": 0, "last_poll_at": None}
+
+    def poll(self):
+        """Take a snapshot and publish its deltas; returns the new deltas"""
+        with self._poll_lock:
+            try:
+                events = self.snapshot()
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            return self._apply(events, time.time())
+
+    def _apply(self, events, now):
+        with self._lock:
+            published = []
+            for event_id, event in events.items():
+                previous = self._events.get(event_id)
+                if previous is None:
+                    change = "new"
+                elif (previous["home_score"], previous["away_score"]) != (event["home_score"], event["away_score"]):
+                    change = "score"
+                elif previous["status"] != event["status"]:
+                    change = "status"
+                else:
+                    continue
+                published.append(self._delta(change, event, previous, now))
+            for event_id in self._events.keys() - events.keys():
+                published.append(self._delta("removed", self._events[event_id], None, now))
+            self._events = dict(events)
+            self._deltas.extend(published)
+            self.stats["polls"] += 1
+            self.stats["deltas"] += len(published)
+            self.stats["last_poll_at"] = now
+        return published
+
+    def _delta(self, change, event, previous, now):
+        self._seq += 1
+        delta = {"seq": self._seq, "type": change, "event_id": event["event_id"], "event": dict(event), "at": now}
+        if previous is not None:
+            delta["previous"] = {field: previous[field] for field in SCORE_FIELDS}
+        return delta
+
+    def current(self):
+        """Full state for a new client: {"seq", "events"}"""
+        with self._lock:
+            return {"seq": self._seq, "events": [dict(event) for event in self._events.values()]}
+
+    def since(self, seq):
+        """Deltas after seq: {"seq", "deltas", "reset"}
+
+        reset is True when deltas after seq were already dropped (or the feed
+        restarted); the client should then reload current().
+        """
+        with self._lock:
+            oldest = self._deltas[0]["seq"] if self._deltas else self._seq + 1
+            if seq > self._seq or (seq < self._seq and seq + 1 < oldest):
+                return {"seq": self._seq, "deltas": [], "reset": True}
+            return {"seq": self._seq, "deltas": [delta for delta in self._deltas if delta["seq"] > seq], "reset": False}
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["events"] = len(self._events)
+            stats["seq"] = self._seq
+            stats["buffered_deltas"] = len(self._deltas)
+        return stats
@@ -0,0 +1,157 @@
+import os
+import time
+import logging
+import queue
+import threading
+
+import tracing
+from llm_queue import llm_queue
+
+LLM_MODEL = os.getenv("SPORTSCHAT_LLM_MODEL", "llama3.2")
+# How long Ollama keeps the model loaded after each request
+LLM_KEEP_ALIVE = os.getenv("SPORTSCHAT_LLM_KEEP_ALIVE", "30m")
+WARMUP_ENABLED = os.getenv("SPORTSCHAT_LLM_WARMUP", "1") != "0"
+
+PROCESS_START = time.time()
+
+logger = logging.getLogger(__name__)
+
+_llm = None
+_llm_lock = threading.Lock()
+_warmup_thread = None
+_stats = {
+    "client_created_after": None,    # Seconds from startup to client construction
+    "warmup_seconds": None,          # How long Ollama took to load the model
+    "warmup_error": None,
+    "first_answer_after": None,      # Seconds from startup to the first completed answer
+    "first_answer_seconds": None,    # Generation time of that first answer
+    "answers": 0,
+}
+
+
+def get_llm():
+    """Return the process-wide Ollama client, constructing it on first use"""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                # Imported here: langchain_ollama pulls in most of langchain and is slow to import
+                from langchain_ollama import OllamaLLM
+
+                _llm = OllamaLLM(model=LLM_MODEL, keep_alive=LLM_KEEP_ALIVE)
+                _stats["client_created_after"] = round(time.time() - PROCESS_START, 3)
+    return _llm
+
+
+def _warm_up():
+    started = time.time()
+    try:
+        import ollama
+
+        # An empty prompt makes Ollama load the model without generating anything
+        ollama.Client(host=get_llm().base_url).generate(model=LLM_MODEL, prompt="", keep_alive=LLM_KEEP_ALIVE)
+        _stats["warmup_seconds"] = round(time.time() - started, 3)
+    except Exception as e:
+        _stats["warmup_error"] = str(e)
+
+
+def warm_up_llm():
+    """Load the model into Ollama on a background thread (once per process)"""
+    global _warmup_thread
+    if not WARMUP_ENABLED:
+        return None
+    with _llm_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="llm-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def record_answer(started):
+    """Count a completed answer; the first one reports cold-start to first-answer time"""
+    _stats["answers"] += 1
+    if _stats["first_answer_after"] is None:
+        now = time.time()
+        _stats["first_answer_after"] = round(now - PROCESS_START, 3)
+        _stats["first_answer_seconds"] = round(now - started, 3)
+        warmup = f"{_stats['warmup_seconds']:.1f}s" if _stats["warmup_seconds"] is not None else "not run"
+        logger.debug("first answer %.1fs after startup (generation %.1fs, warm-up %s)",
+                     _stats["first_answer_after"], _stats["first_answer_seconds"], warmup)
+
+
+def invoke_llm(prompt):
+    """Generate a complete answer for a prompt (queued behind other LLM work)"""
+    started = time.time()
+    with tracing.span("llm", "invoke", model=LLM_MODEL) as span:
+        job = llm_queue.submit(lambda job: get_llm().invoke(prompt))
+        response = job.wait()
+        span["bytes"] = len(response.encode("utf-8"))
+        span["queue_wait_ms"] = round((job.started_at - job.enqueued_at) * 1000, 1)
+    record_answer(started)
+    return response
+
+
+def stream_llm(prompt):
+    """Yield an answer chunk by chunk as the model generates it (queued behind other LLM work)"""
+    started = time.time()
+
+    def generate(job):
+        for chunk in get_llm().stream(prompt):
+            # Stop generating as soon as nobody is listening any more
+            if not job.emit(chunk):
+                break
+
+    with tracing.span("llm", "stream", model=LLM_MODEL) as span:
+        job = llm_queue.submit(generate)
+        for chunk in job.iter_chunks():
+            if "first_chunk_ms" not in span:
+                span["first_chunk_ms"] = round((time.time() - started) * 1000, 1)
+            span["bytes"] += len(chunk.encode("utf-8"))
+            yield chunk
+        span["queue_wait_ms"] = round((job.started_at - job.enqueued_at) * 1000, 1)
+    record_answer(started)
+
+
+def batch_llm(prompts, max_concurrency=4):
+    """Yield (index, answer or Exception, timings) for each prompt as it completes, running up to max_concurrency at once
+
+    timings has the prompt's own latency_ms (queued to finished), queue_wait_ms
+    and generation_ms, independent of the prompts before it.
+    """
+    started = time.time()
+    results = queue.Queue()
+    next_index = 0
+    in_flight = 0
+
+    def submit(index):
+        # Batch work waits for room in the queue instead of being rejected
+        job = llm_queue.submit(lambda job: get_llm().invoke(prompts[index]), block=True)
+        job.add_done_callback(lambda job: results.put((index, job)))
+
+    while next_index < len(prompts) or in_flight:
+        while next_index < len(prompts) and in_flight < max_concurrency:
+            submit(next_index)
+            next_index += 1
+            in_flight += 1
+
+        index, job = results.get()
+        in_flight -= 1
+        if job.error is None:
+            record_answer(started)
+            status, size = "ok", len(job.result.encode("utf-8"))
+        else:
+            status, size = "error", 0
+        duration = job.finished_at - (job.started_at or job.finished_at)
+        tracing.record_span("llm", "batch", time.perf_counter() - duration, duration, status, size, model=LLM_MODEL)
+        started_at = job.started_at or job.finished_at
+        timings = {
+            "latency_ms": round((job.finished_at - job.enqueued_at) * 1000, 1),
+            "queue_wait_ms": round((started_at - job.enqueued_at) * 1000, 1),
+            "generation_ms": round(duration * 1000, 1),
+        }
+        yield index, job.result if job.error is None else job.error, timings
+
+
+def get_llm_startup_stats():
+    """Return client construction, warm-up and cold-start to first-answer timings"""
+    return dict(_stats)
@@ -0,0 +1,211 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from contextvars import ContextVar
+
+LLM_WORKERS = int(os.getenv("SPORTSCHAT_LLM_WORKERS", "2"))          # Generations Ollama runs at once
+LLM_QUEUE_DEPTH = int(os.getenv("SPORTSCHAT_LLM_QUEUE_DEPTH", "8"))  # Jobs allowed to wait for a worker
+
+# Optional callable telling whether the caller (e.g. a Streamlit session) is still there
+current_liveness_check = ContextVar("current_liveness_check", default=None)
+
+_DONE = object()
+
+
+class LLMQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its maximum depth"""
+
+
+class LLMJobCancelled(Exception):
+    """Raised to whoever waits on a job that was cancelled before it finished"""
+
+
+class LLMJob:
+    """One unit of LLM work waiting for, or running on, a queue worker"""
+
+    def __init__(self, fn, is_alive=None):
+        self.fn = fn
+        self.is_alive = is_alive
+        self.enqueued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.chunks = queue.Queue()  # Filled by streaming jobs via emit()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        """True if cancel() was called or the submitting session has gone away"""
+        if self._cancelled.is_set():
+            return True
+        if self.is_alive is not None:
+            try:
+                alive = self.is_alive()
+            except Exception:
+                alive = True
+            if not alive:
+                self._cancelled.set()
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def emit(self, chunk):
+        """Hand a streamed chunk to the consumer; returns False once the job is cancelled"""
+        if self.cancelled:
+            return False
+        self.chunks.put(chunk)
+        return True
+
+    def done(self):
+        return self._done.is_set()
+
+    def add_done_callback(self, callback):
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.chunks.put(_DONE)
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def wait(self, timeout=None):
+        """Block until the job finishes and return its result (re-raising its error)"""
+        if not self._done.wait(timeout):
+            raise TimeoutError("LLM job did not finish in time")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def iter_chunks(self):
+        """Yield streamed chunks until the job finishes; cancels the job if the consumer stops early"""
+        finished = False
+        try:
+            while True:
+                chunk = self.chunks.get()
+                if chunk is _DONE:
+                    finished = True
+                    break
+                yield chunk
+        finally:
+            if not finished:
+                self.cancel()
+        if self.error is not None:
+            raise self.error
+        if self._cancelled.is_set():
+            raise LLMJobCancelled("cancelled while streaming")
+
+
+class LLMJobQueue:
+    """Bounded queue in front of the LLM with a fixed number of workers
+
+    submit() rejects with LLMQueueFull once max_depth jobs are waiting (or,
+    with block=True, waits for room). Jobs whose session has gone away are
+    dropped before they start and stop streaming as soon as they notice.
+    """
+
+    def __init__(self, workers=LLM_WORKERS, max_depth=LLM_QUEUE_DEPTH):
+        self.workers = workers
+        self.max_depth = max_depth
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wait_times = deque(maxlen=1000)
+        self._running = 0
+        self.stats = {"submitted": 0, "rejected": 0, "cancelled": 0, "completed": 0, "failed": 0}
+
+    def _ensure_workers(self):
+        if len(self._threads) >= self.workers:
+            return
+        with self._start_lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"llm-worker-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn, is_alive=None, block=False, timeout=None):
+        """Queue fn(job) to run on a worker and return the LLMJob"""
+        self._ensure_workers()
+        if is_alive is None:
+            is_alive = current_liveness_check.get()
+        job = LLMJob(fn, is_alive)
+        try:
+            self._queue.put(job, block=block, timeout=timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats["rejected"] += 1
+            raise LLMQueueFull(f"LLM queue is full ({self.max_depth} jobs waiting)")
+        with self._stats_lock:
+            self.stats["submitted"] += 1
+        return job
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job.cancelled:
+                with self._stats_lock:
+                    self.stats["cancelled"] += 1
+                job._finish(error=LLMJobCancelled("cancelled before it started"))
+                continue
+
+            job.started_at = time.time()
+            with self._stats_lock:
+                self._running += 1
+                self._wait_times.append(job.started_at - job.enqueued_at)
+            try:
+                result = job.fn(job)
+            except Exception as e:
+                with self._stats_lock:
+                    self.stats["failed"] += 1
+                job._finish(error=e)
+            else:
+                with self._stats_lock:
+                    if job.cancelled:
+                        self.stats["cancelled"] += 1
+                    else:
+                        self.stats["completed"] += 1
+                job._finish(result=result)
+            finally:
+                with self._stats_lock:
+                    self._running -= 1
+
+    def get_stats(self):
+        """Return queue depth, running jobs, counters and wait-time percentiles (seconds)"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            stats["depth"] = self._queue.qsize()
+            stats["max_depth"] = self.max_depth
+            stats["running"] = self._running
+            stats["workers"] = self.workers
+            waits = sorted(self._wait_times)
+        if waits:
+            stats["wait_p50"] = round(waits[len(waits) // 2], 3)
+            stats["wait_p95"] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3)
+            stats["wait_max"] = round(waits[-1], 3)
+        else:
+            stats["wait_p50"] = stats["wait_p95"] = stats["wait_max"] = 0.0
+        return stats
+
+
+llm_queue = LLMJobQueue()
+
+
+def bind_liveness_check(is_alive):
+    """Make LLM jobs submitted from the current context cancel once is_alive() returns False"""
+    current_liveness_check.set(is_alive)
@@ -0,0 +1,157 @@
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+
+import http_client
+from ttl_cache import CACHE_DIR
+
+ASSET_DIR = os.path.join(CACHE_DIR, "logo_assets")
+INDEX_PATH = os.path.join(ASSET_DIR, "index.json")
+THUMBNAIL_SCALE = 2  # Render at 2x the display width so logos stay sharp on high-DPI screens
+FAILED_RETRY_AFTER = 15 * 60
+
+_lock = threading.Lock()
+_index = None     # logo URL -> content-addressed file name
+_failed = {}      # logo URL -> time of last failed download
+_stats = {"downloads": 0, "download_errors": 0, "thumbnails_rendered": 0}
+
+EXTENSIONS = {
+    "image/svg+xml": ".svg",
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_PATH, encoding="utf-8") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    tmp_path = f"{INDEX_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_index, f)
+    os.replace(tmp_path, INDEX_PATH)
+
+
+def _guess_extension(url, content_type, content):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in EXTENSIONS:
+        return EXTENSIONS[content_type]
+    if content.lstrip()[:5] in (b"<?xml", b"<svg ", b"<svg>"):
+        return ".svg"
+    ext = os.path.splitext(url.split("?")[0])[1].lower()
+    return ext if ext in EXTENSIONS.values() else ".png"
+
+
+def get_asset_path(url):
+    """Download a logo once and return the path of its content-addressed local copy ("" on failure)"""
+    if not url:
+        return ""
+
+    with _lock:
+        name = _load_index().get(url)
+        failed_at = _failed.get(url)
+    if name and os.path.exists(os.path.join(ASSET_DIR, name)):
+        return os.path.join(ASSET_DIR, name)
+    if failed_at and time.time() - failed_at < FAILED_RETRY_AFTER:
+        return ""
+
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()
+        content = response.content
+    except Exception:
+        with _lock:
+            _failed[url] = time.time()
+            _stats["download_errors"] += 1
+        return ""
+
+    name = hashlib.sha256(content).hexdigest() + _guess_extension(url, response.headers.get("Content-Type"), content)
+    path = os.path.join(ASSET_DIR, name)
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    with _lock:
+        _index[url] = name
+        _failed.pop(url, None)
+        _stats["downloads"] += 1
+        _save_index()
+    return path
+
+
+def _render_thumbnail(source_path, thumb_path, width):
+    from PIL import Image
+
+    if source_path.endswith(".svg"):
+        try:
+            import cairosvg  # Rasterises SVG logos, which are most of the logo tables
+        except (ImportError, OSError):
+            # Not installed, or the system cairo library is missing
+            return False
+        png_bytes = cairosvg.svg2png(url=source_path, output_width=width)
+        image = Image.open(io.BytesIO(png_bytes))
+    else:
+        image = Image.open(source_path)
+        image.load()
+
+    image = image.convert("RGBA")
+    if image.width != width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.LANCZOS)
+
+    tmp_path = f"{thumb_path}.tmp"
+    image.save(tmp_path, format="PNG", optimize=True)
+    os.replace(tmp_path, thumb_path)
+    return True
+
+
+def get_thumbnail(url, width):
+    """Return a local file for a logo pre-sized for the given display width
+
+    Falls back to the full-size local copy (e.g. an SVG when cairosvg or cairo isn't
+    installed), and to "" if the logo can't be downloaded at all.
+    """
+    source_path = get_asset_path(url)
+    if not source_path:
+        return ""
+
+    pixel_width = width * THUMBNAIL_SCALE
+    digest = os.path.splitext(os.path.basename(source_path))[0]
+    thumb_path = os.path.join(ASSET_DIR, f"{digest}_{pixel_width}.png")
+    if os.path.exists(thumb_path):
+        return thumb_path
+
+    try:
+        if _render_thumbnail(source_path, thumb_path, pixel_width):
+            with _lock:
+                _stats["thumbnails_rendered"] += 1
+            return thumb_path
+    except Exception:
+        pass
+    return source_path
+
+
+def get_stats():
+    """Return download/render counters and how many logos are mirrored"""
+    with _lock:
+        stats = dict(_stats)
+        stats["mirrored_logos"] = len(_load_index())
+        stats["failed_urls"] = len(_failed)
+    return stats
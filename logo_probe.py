@@ -0,0 +1,83 @@
+import os
+import time
+import atexit
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import http_client
+from ttl_cache import TTLCache, CACHE_DIR
+
+PROBE_WORKERS = int(os.getenv("SPORTSCHAT_PROBE_WORKERS", "12"))
+PROBE_TIMEOUT = float(os.getenv("SPORTSCHAT_PROBE_TIMEOUT", "1"))     # Per HEAD request
+PROBE_DEADLINE = float(os.getenv("SPORTSCHAT_PROBE_DEADLINE", "2"))   # For the whole candidate list
+DEAD_URL_TTL = int(os.getenv("SPORTSCHAT_DEAD_URL_TTL", str(24 * 3600)))
+
+_executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix="logo-probe")
+
+# URLs that answered 404/410, so they aren't probed again on the next query
+dead_urls = TTLCache(
+    max_entries=5000,
+    max_bytes=2 * 1024 * 1024,
+    default_ttl=DEAD_URL_TTL,
+    path=os.path.join(CACHE_DIR, "dead_logo_urls.json"),
+)
+atexit.register(dead_urls.flush)
+
+
+# Only these answers say a URL is gone; anything else may be a passing outage
+DEAD_STATUSES = (404, 410)
+
+
+def probe_url(url, timeout=PROBE_TIMEOUT):
+    """HEAD a URL (following redirects); True if it serves content, False if it is gone,
+    None if undecided (timeout, network error, 5xx, ...)"""
+    try:
+        # No retries: a dead host costs one timeout, not several, and the deadline holds
+        response = http_client.head(url, timeout=timeout, allow_redirects=True, retries=False)
+    except Exception:
+        return None
+    if response.status_code == 200:
+        return True
+    if response.status_code in DEAD_STATUSES:
+        return False
+    return None
+
+
+def first_live_url(urls, deadline=PROBE_DEADLINE, timeout=PROBE_TIMEOUT):
+    """Probe candidate URLs concurrently and return the first live one in priority order
+
+    Returns "" if every candidate is known to be dead, and None if none was
+    confirmed live but some couldn't be decided (deadline, timeout, network
+    error), so callers don't remember a passing outage as "no logo". Probes
+    still queued when an answer is found are cancelled.
+    """
+    candidates = [url for url in dict.fromkeys(urls) if url and url not in dead_urls]
+    if not candidates:
+        return ""
+    undecided = False
+
+    # Each probe runs in a copy of the caller's context so its HEAD span lands in the caller's trace
+    futures = [_executor.submit(contextvars.copy_context().run, probe_url, url, timeout) for url in candidates]
+    end = time.monotonic() + deadline
+    found = ""
+    try:
+        for url, future in zip(candidates, futures):
+            try:
+                alive = future.result(timeout=max(0.0, end - time.monotonic()))
+            except TimeoutError:
+                # Undecided before the deadline; leave it out of the dead cache
+                undecided = True
+                continue
+            if alive:
+                found = url
+                break
+            if alive is False:
+                dead_urls.set(url, True)
+            else:
+                undecided = True
+    finally:
+        for future in futures:
+            future.cancel()
+    if not found and undecided:
+        return None
+    return found
@@ -0,0 +1,86 @@
+import os
+import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ttl_cache import TTLCache, CACHE_DIR
+
+# A resolved logo is served forever but re-checked in the background once it is this old
+REVALIDATE_AFTER = int(os.getenv("SPORTSCHAT_LOGO_REVALIDATE_AFTER", str(7 * 24 * 3600)))
+# Teams with no logo found are re-checked sooner
+EMPTY_REVALIDATE_AFTER = int(os.getenv("SPORTSCHAT_LOGO_EMPTY_REVALIDATE_AFTER", str(3600)))
+KEEP_FOR = 365 * 24 * 3600
+
+_store = TTLCache(
+    max_entries=20000,
+    max_bytes=8 * 1024 * 1024,
+    default_ttl=KEEP_FOR,
+    path=os.path.join(CACHE_DIR, "team_logos.json"),
+    save_interval=5,
+)
+atexit.register(_store.flush)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="logo-revalidate")
+_pending = set()
+_pending_lock = threading.Lock()
+_stats = {"revalidations": 0, "revalidation_errors": 0, "changed": 0}
+
+
+def set_logo(team_id, logo_url):
+    """Record the resolved logo URL for a team"""
+    _store.set(str(team_id), {"url": logo_url, "checked_at": time.time()})
+
+
+def get_logo(team_id, resolve=None):
+    """Return the stored logo URL for a team (no network I/O), or None if never resolved
+
+    If the entry is stale and a resolve callable is given, it is re-run on a
+    background thread and the stored URL updated when it finishes.
+    """
+    entry = _store.get(str(team_id))
+    if entry is None:
+        return None
+
+    max_age = REVALIDATE_AFTER if entry["url"] else EMPTY_REVALIDATE_AFTER
+    if resolve is not None and time.time() - entry["checked_at"] > max_age:
+        revalidate(team_id, resolve)
+    return entry["url"]
+
+
+def revalidate(team_id, resolve):
+    """Queue a background re-resolution of a team's logo (once per team at a time)"""
+    team_id = str(team_id)
+    with _pending_lock:
+        if team_id in _pending:
+            return
+        _pending.add(team_id)
+    _executor.submit(_revalidate, team_id, resolve)
+
+
+def _revalidate(team_id, resolve):
+    try:
+        logo_url = resolve()
+        if logo_url is None:
+            # Inconclusive (e.g. network trouble); keep the stored URL and retry at the next read
+            _stats["revalidation_errors"] += 1
+            return
+        old = _store.get(team_id)
+        if old is None or old["url"] != logo_url:
+            _stats["changed"] += 1
+        set_logo(team_id, logo_url)
+        _stats["revalidations"] += 1
+    except Exception:
+        _stats["revalidation_errors"] += 1
+    finally:
+        with _pending_lock:
+            _pending.discard(team_id)
+
+
+def get_stats():
+    """Return store size, hit/miss counters and revalidation counts"""
+    stats = _store.get_stats()
+    stats.update(_stats)
+    with _pending_lock:
+        stats["pending_revalidations"] = len(_pending)
+    return stats
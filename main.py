@@ -1,387 +1,127 @@
 import os
-import requests
 from dotenv import load_dotenv
-from langchain_ollama import OllamaLLM
-from datetime import datetime, timedelta
 
-# Load environment variables
+# Load environment variables first so every module below sees settings from .env
 load_dotenv()
+
+import atexit
+import asyncio
+import contextvars
+import threading
+import time
+import concurrent.futures
+import http_client
+import team_store
+import answer_cache
+import semantic_cache
+import logo_store
+import sports_db
+from team_logos import find_team_logo
+from logo_probe import first_live_url
+from ttl_cache import TTLCache, CACHE_DIR
+from singleflight import SingleFlight
+from refresher import BackgroundRefresher
+from live_scores import LiveScoreFeed
+import llm_client
+from llm_client import invoke_llm, stream_llm, warm_up_llm
+from llm_queue import llm_queue, LLMQueueFull
+from datetime import datetime, timedelta
+
 # API Keys
 THESPORTSDB_API_KEY = os.getenv("THESPORTSDB_API_KEY")
+SPORTSDB_BASE_URL = "https://www.thesportsdb.com/api/v1/json"
+
+# How long (seconds) each TheSportsDB endpoint stays fresh in the response cache
+SPORTSDB_CACHE_TTLS = {
+    "searchteams.php": 24 * 3600,   # Team records almost never change
+    "search_all_teams.php": 24 * 3600,
+    "lookupteam.php": 24 * 3600,
+    "eventslast.php": 15 * 60,      # Only changes around match time
+    "eventsnext.php": 15 * 60,
+    "lookuptable.php": 6 * 3600,    # Standings move a few times a week
+}
+DEFAULT_SPORTSDB_CACHE_TTL = 10 * 60
 
-# Ollama Client with updated class
-llm = OllamaLLM(model="llama3.2")  # Use the updated class
+# TheSportsDB league names for the leagues SportsChat covers; all their teams are
+# prefetched in one call per league so known teams resolve without a search
+PREFETCH_LEAGUES = {
+    "EPL": "English Premier League",
+    "NBA": "NBA",
+    "NFL": "NFL",
+    "MLB": "MLB",
+    "NHL": "NHL",
+}
+PREFETCH_ENABLED = os.getenv("SPORTSCHAT_PREFETCH_LEAGUES", "1") != "0"
+
+# Results, fixtures and standings are read from the local store (sports_db). Each team asked
+# about is re-synced in the background on a cadence set by its schedule: every
+# LIVE_POLL_INTERVAL while a match is on, otherwise at the next kick-off or after SYNC_MAX_AGE
+STANDINGS_SEASON = "2023-2024"
+SYNC_MAX_AGE = int(os.getenv("SPORTSCHAT_SYNC_MAX_AGE", str(24 * 3600)))
+LIVE_POLL_INTERVAL = int(os.getenv("SPORTSCHAT_LIVE_POLL_INTERVAL", "60"))
+SYNC_MIN_INTERVAL = int(os.getenv("SPORTSCHAT_SYNC_MIN_INTERVAL", str(10 * 60)))  # While a result is overdue or a sync failed
+MATCH_DURATION = 3 * 3600            # Time after kick-off by which a result is expected
+STALE_FIXTURE_AGE = 24 * 3600        # Unfinished matches older than this are treated as postponed
+LIVE_WINDOW_BEFORE = 2 * MATCH_DURATION  # The live score feed shows matches in play, ones that started this long ago
+LIVE_WINDOW_AFTER = 2 * 3600             # ... and ones starting within this long
+BACKGROUND_REFRESH = os.getenv("SPORTSCHAT_BACKGROUND_REFRESH", "1") != "0"
+
+sportsdb_cache = TTLCache(
+    max_entries=int(os.getenv("SPORTSCHAT_CACHE_MAX_ENTRIES", "2000")),
+    max_bytes=int(os.getenv("SPORTSCHAT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+    default_ttl=DEFAULT_SPORTSDB_CACHE_TTL,
+    path=os.path.join(CACHE_DIR, "sportsdb_responses.json"),
+)
+atexit.register(sportsdb_cache.flush)
+sportsdb_flight = SingleFlight()
+sync_flight = SingleFlight()
+_prefetch_thread = None
+_prefetch_lock = threading.Lock()
+
+# The Ollama client is created lazily by llm_client.get_llm() on first use
+# and every call waits its turn in llm_queue; when the queue is full we answer with this instead
+LLM_BUSY_MESSAGE = "SportsChat is answering a lot of questions right now. Please try again in a moment."
 
 def get_team_logo(team_name, league=None):
     """Return official team logo URL based on team name and league"""
-    team_name_lower = team_name.lower().strip()
-    
-    # Team logo database with official URLs where possible
-    logo_database = {
-        # Premier League (all 20 teams)
-        "arsenal": "https://resources.premierleague.com/premierleague/badges/t3.svg",
-        "aston villa": "https://resources.premierleague.com/premierleague/badges/t7.svg",
-        "bournemouth": "https://resources.premierleague.com/premierleague/badges/t91.svg",
-        "brentford": "https://resources.premierleague.com/premierleague/badges/t94.svg",
-        "brighton": "https://resources.premierleague.com/premierleague/badges/t36.svg",
-        "burnley": "https://resources.premierleague.com/premierleague/badges/t90.svg",
-        "chelsea": "https://resources.premierleague.com/premierleague/badges/t8.svg",
-        "crystal palace": "https://resources.premierleague.com/premierleague/badges/t31.svg",
-        "everton": "https://resources.premierleague.com/premierleague/badges/t11.svg",
-        "fulham": "https://resources.premierleague.com/premierleague/badges/t54.svg",
-        "ipswich": "https://resources.premierleague.com/premierleague/badges/t52.svg",
-        "leicester": "https://resources.premierleague.com/premierleague/badges/t13.svg",
-        "liverpool": "https://resources.premierleague.com/premierleague/badges/t14.svg",
-        "luton": "https://resources.premierleague.com/premierleague/badges/t102.svg",
-        "manchester city": "https://resources.premierleague.com/premierleague/badges/t43.svg",
-        "manchester united": "https://resources.premierleague.com/premierleague/badges/t1.svg",
-        "newcastle": "https://resources.premierleague.com/premierleague/badges/t4.svg",
-        "newcastle united": "https://resources.premierleague.com/premierleague/badges/t4.svg",
-        "nottingham forest": "https://resources.premierleague.com/premierleague/badges/t17.svg",
-        "sheffield united": "https://resources.premierleague.com/premierleague/badges/t49.svg",
-        "southampton": "https://resources.premierleague.com/premierleague/badges/t20.svg",
-        "tottenham": "https://resources.premierleague.com/premierleague/badges/t6.svg",
-        "tottenham hotspur": "https://resources.premierleague.com/premierleague/badges/t6.svg",
-        "west ham": "https://resources.premierleague.com/premierleague/badges/t21.svg",
-        "west ham united": "https://resources.premierleague.com/premierleague/badges/t21.svg",
-        "wolves": "https://resources.premierleague.com/premierleague/badges/t39.svg",
-        "wolverhampton": "https://resources.premierleague.com/premierleague/badges/t39.svg",
-        "wolverhampton wanderers": "https://resources.premierleague.com/premierleague/badges/t39.svg",
-        
-        # NBA (all 30 teams)
-        "atlanta hawks": "https://cdn.nba.com/logos/nba/1610612737/global/L/logo.svg",
-        "boston celtics": "https://cdn.nba.com/logos/nba/1610612738/global/L/logo.svg",
-        "brooklyn nets": "https://cdn.nba.com/logos/nba/1610612751/global/L/logo.svg",
-        "charlotte hornets": "https://cdn.nba.com/logos/nba/1610612766/global/L/logo.svg",
-        "chicago bulls": "https://cdn.nba.com/logos/nba/1610612741/global/L/logo.svg",
-        "cleveland cavaliers": "https://cdn.nba.com/logos/nba/1610612739/global/L/logo.svg",
-        "dallas mavericks": "https://cdn.nba.com/logos/nba/1610612742/global/L/logo.svg",
-        "denver nuggets": "https://cdn.nba.com/logos/nba/1610612743/global/L/logo.svg",
-        "detroit pistons": "https://cdn.nba.com/logos/nba/1610612765/global/L/logo.svg",
-        "golden state warriors": "https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg",
-        "houston rockets": "https://cdn.nba.com/logos/nba/1610612745/global/L/logo.svg",
-        "indiana pacers": "https://cdn.nba.com/logos/nba/1610612754/global/L/logo.svg",
-        "la clippers": "https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg",
-        "los angeles clippers": "https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg",
-        "los angeles lakers": "https://cdn.nba.com/logos/nba/1610616839/global/L/logo.svg",
-        "memphis grizzlies": "https://cdn.nba.com/logos/nba/1610612763/global/L/logo.svg",
-        "miami heat": "https://cdn.nba.com/logos/nba/1610612748/global/L/logo.svg",
-        "milwaukee bucks": "https://cdn.nba.com/logos/nba/1610612749/global/L/logo.svg",
-        "minnesota timberwolves": "https://cdn.nba.com/logos/nba/1610612750/global/L/logo.svg",
-        "new orleans pelicans": "https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg",
-        "new york knicks": "https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg",
-        "oklahoma city thunder": "https://cdn.nba.com/logos/nba/1610612760/global/L/logo.svg",
-        "orlando magic": "https://cdn.nba.com/logos/nba/1610612753/global/L/logo.svg",
-        "philadelphia 76ers": "https://cdn.nba.com/logos/nba/1610612755/global/L/logo.svg",
-        "phoenix suns": "https://cdn.nba.com/logos/nba/1610612756/global/L/logo.svg",
-        "portland trail blazers": "https://cdn.nba.com/logos/nba/1610612757/global/L/logo.svg",
-        "sacramento kings": "https://cdn.nba.com/logos/nba/1610612758/global/L/logo.svg",
-        "san antonio spurs": "https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg",
-        "toronto raptors": "https://cdn.nba.com/logos/nba/1610612761/global/L/logo.svg",
-        "utah jazz": "https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg",
-        "washington wizards": "https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg",
-        
-        # NFL (all 32 teams)
-        "arizona cardinals": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/ARI",
-        "atlanta falcons": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/ATL",
-        "baltimore ravens": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/BAL",
-        "buffalo bills": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/BUF",
-        "carolina panthers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CAR",
-        "chicago bears": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CHI",
-        "cincinnati bengals": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CIN",
-        "cleveland browns": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CLE",
-        "dallas cowboys": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DAL",
-        "denver broncos": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DEN",
-        "detroit lions": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DET",
-        "green bay packers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/GB",
-        "houston texans": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/HOU",
-        "indianapolis colts": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/IND",
-        "jacksonville jaguars": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/JAX",
-        "kansas city chiefs": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/KC",
-        "las vegas raiders": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LV",
-        "los angeles chargers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LAC",
-        "los angeles rams": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LA",
-        "miami dolphins": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/MIA",
-        "minnesota vikings": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/MIN",
-        "new england patriots": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NE",
-        "new orleans saints": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NO",
-        "new york giants": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NYG",
-        "new york jets": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NYJ",
-        "philadelphia eagles": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/PHI",
-        "pittsburgh steelers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/PIT",
-        "san francisco 49ers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/SF",
-        "seattle seahawks": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/SEA",
-        "tampa bay buccaneers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/TB",
-        "tennessee titans": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/TEN",
-        "washington commanders": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/WAS",
-        
-        # MLB (all 30 teams)
-        "arizona diamondbacks": "https://www.mlbstatic.com/team-logos/team-cap-on-light/109.svg",
-        "atlanta braves": "https://www.mlbstatic.com/team-logos/team-cap-on-light/144.svg",
-        "baltimore orioles": "https://www.mlbstatic.com/team-logos/team-cap-on-light/110.svg",
-        "boston red sox": "https://www.mlbstatic.com/team-logos/team-cap-on-light/111.svg",
-        "chicago cubs": "https://www.mlbstatic.com/team-logos/team-cap-on-light/112.svg",
-        "chicago white sox": "https://www.mlbstatic.com/team-logos/team-cap-on-light/145.svg",
-        "cincinnati reds": "https://www.mlbstatic.com/team-logos/team-cap-on-light/113.svg",
-        "cleveland guardians": "https://www.mlbstatic.com/team-logos/team-cap-on-light/114.svg",
-        "colorado rockies": "https://www.mlbstatic.com/team-logos/team-cap-on-light/115.svg",
-        "detroit tigers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/116.svg",
-        "houston astros": "https://www.mlbstatic.com/team-logos/team-cap-on-light/117.svg",
-        "kansas city royals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/118.svg",
-        "los angeles angels": "https://www.mlbstatic.com/team-logos/team-cap-on-light/108.svg",
-        "los angeles dodgers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/119.svg",
-        "miami marlins": "https://www.mlbstatic.com/team-logos/team-cap-on-light/146.svg",
-        "milwaukee brewers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/158.svg",
-        "minnesota twins": "https://www.mlbstatic.com/team-logos/team-cap-on-light/142.svg",
-        "new york mets": "https://www.mlbstatic.com/team-logos/team-cap-on-light/121.svg",
-        "new york yankees": "https://www.mlbstatic.com/team-logos/team-cap-on-light/147.svg",
-        "oakland athletics": "https://www.mlbstatic.com/team-logos/team-cap-on-light/133.svg",
-        "philadelphia phillies": "https://www.mlbstatic.com/team-logos/team-cap-on-light/143.svg",
-        "pittsburgh pirates": "https://www.mlbstatic.com/team-logos/team-cap-on-light/134.svg",
-        "san diego padres": "https://www.mlbstatic.com/team-logos/team-cap-on-light/135.svg",
-        "san francisco giants": "https://www.mlbstatic.com/team-logos/team-cap-on-light/137.svg",
-        "seattle mariners": "https://www.mlbstatic.com/team-logos/team-cap-on-light/136.svg",
-        "st. louis cardinals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/138.svg",
-        "tampa bay rays": "https://www.mlbstatic.com/team-logos/team-cap-on-light/139.svg",
-        "texas rangers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/140.svg",
-        "toronto blue jays": "https://www.mlbstatic.com/team-logos/team-cap-on-light/141.svg",
-        "washington nationals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/120.svg",
-        
-        # NHL (all 32 teams)
-        "anaheim ducks": "https://assets.nhle.com/logos/nhl/svg/ANA_light.svg",
-        "arizona coyotes": "https://assets.nhle.com/logos/nhl/svg/ARI_light.svg",
-        "boston bruins": "https://assets.nhle.com/logos/nhl/svg/BOS_light.svg",
-        "buffalo sabres": "https://assets.nhle.com/logos/nhl/svg/BUF_light.svg",
-        "calgary flames": "https://assets.nhle.com/logos/nhl/svg/CGY_light.svg",
-        "carolina hurricanes": "https://assets.nhle.com/logos/nhl/svg/CAR_light.svg",
-        "chicago blackhawks": "https://assets.nhle.com/logos/nhl/svg/CHI_light.svg",
-        "colorado avalanche": "https://assets.nhle.com/logos/nhl/svg/COL_light.svg",
-        "columbus blue jackets": "https://assets.nhle.com/logos/nhl/svg/CBJ_light.svg",
-        "dallas stars": "https://assets.nhle.com/logos/nhl/svg/DAL_light.svg",
-        "detroit red wings": "https://assets.nhle.com/logos/nhl/svg/DET_light.svg",
-        "edmonton oilers": "https://assets.nhle.com/logos/nhl/svg/EDM_light.svg",
-        "florida panthers": "https://assets.nhle.com/logos/nhl/svg/FLA_light.svg",
-        "los angeles kings": "https://assets.nhle.com/logos/nhl/svg/LAK_light.svg",
-        "minnesota wild": "https://assets.nhle.com/logos/nhl/svg/MIN_light.svg",
-        "montreal canadiens": "https://assets.nhle.com/logos/nhl/svg/MTL_light.svg",
-        "nashville predators": "https://assets.nhle.com/logos/nhl/svg/NSH_light.svg",
-        "new jersey devils": "https://assets.nhle.com/logos/nhl/svg/NJD_light.svg",
-        "new york islanders": "https://assets.nhle.com/logos/nhl/svg/NYI_light.svg",
-        "new york rangers": "https://assets.nhle.com/logos/nhl/svg/NYR_light.svg",
-        "ottawa senators": "https://assets.nhle.com/logos/nhl/svg/OTT_light.svg",
-        "philadelphia flyers": "https://assets.nhle.com/logos/nhl/svg/PHI_light.svg",
-        "pittsburgh penguins": "https://assets.nhle.com/logos/nhl/svg/PIT_light.svg",
-        "san jose sharks": "https://assets.nhle.com/logos/nhl/svg/SJS_light.svg",
-        "seattle kraken": "https://assets.nhle.com/logos/nhl/svg/SEA_light.svg",
-        "st. louis blues": "https://assets.nhle.com/logos/nhl/svg/STL_light.svg",
-        "tampa bay lightning": "https://assets.nhle.com/logos/nhl/svg/TBL_light.svg",
-        "toronto maple leafs": "https://assets.nhle.com/logos/nhl/svg/TOR_light.svg",
-        "utah hockey club": "https://assets.nhle.com/logos/nhl/svg/UTAH_light.svg",
-        "vancouver canucks": "https://assets.nhle.com/logos/nhl/svg/VAN_light.svg",
-        "vegas golden knights": "https://assets.nhle.com/logos/nhl/svg/VGK_light.svg",
-        "washington capitals": "https://assets.nhle.com/logos/nhl/svg/WSH_light.svg",
-        "winnipeg jets": "https://assets.nhle.com/logos/nhl/svg/WPG_light.svg"
-    }
-    
-    # Common abbreviations and alternative names for teams
-    special_cases = {
-        # MLB
-        "diamondbacks": "arizona diamondbacks",
-        "d-backs": "arizona diamondbacks",
-        "sox": "boston red sox",  # Default to Red Sox, but this is ambiguous
-        "white sox": "chicago white sox",
-        "red sox": "boston red sox",
-        "guardians": "cleveland guardians",
-        "rockies": "colorado rockies",
-        "tigers": "detroit tigers",
-        "astros": "houston astros",
-        "royals": "kansas city royals",
-        "angels": "los angeles angels",
-        "dodgers": "los angeles dodgers",
-        "marlins": "miami marlins",
-        "brewers": "milwaukee brewers",
-        "twins": "minnesota twins",
-        "mets": "new york mets",
-        "yankees": "new york yankees",
-        "athletics": "oakland athletics",
-        "phillies": "philadelphia phillies",
-        "pirates": "pittsburgh pirates",
-        "padres": "san diego padres",
-        "giants": "san francisco giants",
-        "mariners": "seattle mariners",
-        "cardinals": "st. louis cardinals",
-        "rays": "tampa bay rays",
-        "rangers": "texas rangers",
-        "blue jays": "toronto blue jays",
-        "nationals": "washington nationals",
-        
-        # NFL
-        "cardinals": "arizona cardinals",
-        "falcons": "atlanta falcons",
-        "ravens": "baltimore ravens",
-        "bills": "buffalo bills",
-        "panthers": "carolina panthers",
-        "bears": "chicago bears",
-        "bengals": "cincinnati bengals",
-        "browns": "cleveland browns",
-        "cowboys": "dallas cowboys",
-        "broncos": "denver broncos",
-        "lions": "detroit lions",
-        "packers": "green bay packers",
-        "texans": "houston texans",
-        "colts": "indianapolis colts",
-        "jaguars": "jacksonville jaguars",
-        "chiefs": "kansas city chiefs",
-        "raiders": "las vegas raiders",
-        "chargers": "los angeles chargers",
-        "rams": "los angeles rams",
-        "dolphins": "miami dolphins",
-        "vikings": "minnesota vikings",
-        "patriots": "new england patriots",
-        "saints": "new orleans saints",
-        "giants": "new york giants",
-        "jets": "new york jets",
-        "eagles": "philadelphia eagles",
-        "philly": "philadelphia eagles",
-        "steelers": "pittsburgh steelers",
-        "niners": "san francisco 49ers",
-        "49ers": "san francisco 49ers",
-        "seahawks": "seattle seahawks",
-        "bucs": "tampa bay buccaneers",
-        "buccaneers": "tampa bay buccaneers",
-        "titans": "tennessee titans",
-        "commanders": "washington commanders",
-        "washington football team": "washington commanders",
-        
-        # NBA
-        "hawks": "atlanta hawks",
-        "celtics": "boston celtics",
-        "nets": "brooklyn nets",
-        "hornets": "charlotte hornets",
-        "bulls": "chicago bulls",
-        "cavaliers": "cleveland cavaliers",
-        "cavs": "cleveland cavaliers",
-        "mavs": "dallas mavericks",
-        "mavericks": "dallas mavericks",
-        "nuggets": "denver nuggets",
-        "pistons": "detroit pistons",
-        "warriors": "golden state warriors",
-        "rockets": "houston rockets",
-        "pacers": "indiana pacers",
-        "clippers": "los angeles clippers",
-        "lakers": "los angeles lakers",
-        "grizzlies": "memphis grizzlies",
-        "heat": "miami heat",
-        "bucks": "milwaukee bucks",
-        "timberwolves": "minnesota timberwolves",
-        "wolves": "minnesota timberwolves",
-        "pelicans": "new orleans pelicans",
-        "knicks": "new york knicks",
-        "thunder": "oklahoma city thunder",
-        "magic": "orlando magic",
-        "sixers": "philadelphia 76ers",
-        "76ers": "philadelphia 76ers",
-        "suns": "phoenix suns",
-        "blazers": "portland trail blazers",
-        "trail blazers": "portland trail blazers",
-        "kings": "sacramento kings",
-        "spurs": "san antonio spurs",
-        "raptors": "toronto raptors",
-        "jazz": "utah jazz",
-        "wizards": "washington wizards",
-        
-        # NHL
-        "ducks": "anaheim ducks",
-        "coyotes": "arizona coyotes",
-        "bruins": "boston bruins",
-        "sabres": "buffalo sabres",
-        "flames": "calgary flames",
-        "hurricanes": "carolina hurricanes",
-        "blackhawks": "chicago blackhawks",
-        "avalanche": "colorado avalanche",
-        "blue jackets": "columbus blue jackets",
-        "stars": "dallas stars",
-        "red wings": "detroit red wings",
-        "oilers": "edmonton oilers",
-        "panthers": "florida panthers",
-        "kings": "los angeles kings",
-        "wild": "minnesota wild",
-        "canadiens": "montreal canadiens",
-        "habs": "montreal canadiens",
-        "predators": "nashville predators",
-        "preds": "nashville predators",
-        "devils": "new jersey devils",
-        "islanders": "new york islanders",
-        "rangers": "new york rangers",
-        "senators": "ottawa senators",
-        "sens": "ottawa senators",
-        "flyers": "philadelphia flyers",
-        "penguins": "pittsburgh penguins",
-        "pens": "pittsburgh penguins",
-        "sharks": "san jose sharks",
-        "kraken": "seattle kraken",
-        "blues": "st. louis blues",
-        "lightning": "tampa bay lightning",
-        "bolts": "tampa bay lightning",
-        "maple leafs": "toronto maple leafs",
-        "leafs": "toronto maple leafs",
-        "canucks": "vancouver canucks",
-        "golden knights": "vegas golden knights",
-        "knights": "vegas golden knights",
-        "capitals": "washington capitals",
-        "caps": "washington capitals",
-        "jets": "winnipeg jets",
-        
-        # EPL
-        "gunners": "arsenal",
-        "villa": "aston villa",
-        "cherries": "bournemouth",
-        "bees": "brentford",
-        "seagulls": "brighton",
-        "clarets": "burnley",
-        "blues": "chelsea",
-        "eagles": "crystal palace",
-        "toffees": "everton",
-        "cottagers": "fulham",
-        "tractor boys": "ipswich",
-        "foxes": "leicester",
-        "reds": "liverpool",
-        "hatters": "luton",
-        "citizens": "manchester city",
-        "city": "manchester city",
-        "united": "manchester united",
-        "man utd": "manchester united",
-        "man united": "manchester united",
-        "man city": "manchester city",
-        "magpies": "newcastle united",
-        "forest": "nottingham forest",
-        "blades": "sheffield united",
-        "saints": "southampton",
-        "spurs": "tottenham hotspur",
-        "hammers": "west ham united",
-        "wanderers": "wolverhampton wanderers"
-    }
-    
-    # Check for special cases (abbreviations and common names)
-    if team_name_lower in special_cases:
-        team_name_lower = special_cases[team_name_lower]
-    
-    # Exact match
-    if team_name_lower in logo_database:
-        return logo_database[team_name_lower]
-    
-    # Partial match
-    for team, logo in logo_database.items():
-        if team_name_lower in team or team in team_name_lower:
-            return logo
-    
-    # If no match, try constructing URLs based on team/league patterns
-    if league:
-        # Keep your current league-specific URL construction code
-        pass  # Placeholder for league-specific URL construction logic
-    
-    # If all else fails, return empty string
-    return ""
+    # Lookups go through the prebuilt, league-scoped index in team_logos
+    return find_team_logo(team_name, league)
+
+def fetch_sportsdb(endpoint, fresh=False, **params):
+    """Fetch a TheSportsDB endpoint as JSON, served from the TTL cache when fresh (fresh=True skips the cache)"""
+    cache_key = endpoint + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    data = None if fresh else sportsdb_cache.get(cache_key)
+    if data is None:
+        # Identical requests already in flight (e.g. from other sessions) share one upstream call
+        data = sportsdb_flight.do(cache_key, lambda: fetch_sportsdb_upstream(endpoint, params, cache_key))
+    return data
+
+def fetch_sportsdb_upstream(endpoint, params, cache_key):
+    """Call TheSportsDB and store the JSON response in the cache"""
+    url = f"{SPORTSDB_BASE_URL}/{THESPORTSDB_API_KEY}/{endpoint}"
+    response = http_client.get(url, params=params)
+    data = response.json()
+    # Any response carrying team records feeds the team-id store; cache hits were stored when fetched
+    if isinstance(data, dict) and data.get("teams"):
+        team_store.remember_teams(data["teams"])
+    sportsdb_cache.set(cache_key, data, ttl=SPORTSDB_CACHE_TTLS.get(endpoint, DEFAULT_SPORTSDB_CACHE_TTL))
+    return data
+
+def get_sportsdb_cache_stats():
+    """Return hit/miss/eviction counters for the TheSportsDB response cache"""
+    return sportsdb_cache.get_stats()
+
+def get_sportsdb_coalescing_stats():
+    """Return how many TheSportsDB calls were coalesced into an in-flight request"""
+    return sportsdb_flight.get_stats()
+
+def get_llm_queue_stats():
+    """Return LLM queue depth, running jobs and wait-time metrics"""
+    return llm_queue.get_stats()
+
+def get_llm_startup_stats():
+    """Return LLM client construction, warm-up and cold-start to first-answer timings"""
+    return llm_client.get_llm_startup_stats()
 
 def get_team_info(team_name):
     """Fetch team details from TheSportsDB API"""
@@ -399,12 +139,14 @@ def get_team_info(team_name):
 
 def get_team_details(team_name):
     """Fetch extended team details including logo from TheSportsDB API"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/searchteams.php?t={team_name}"
-    response = requests.get(url)
-    data = response.json()
+    # Teams from the prefetched leagues resolve locally; only unknown names go upstream
+    team = team_store.find_team(team_name)
+    if team is None:
+        data = fetch_sportsdb("searchteams.php", t=team_name)
+        if data.get("teams") and len(data["teams"]) > 0:
+            team = data["teams"][0]
     
-    if data.get("teams") and len(data["teams"]) > 0:
-        team = data["teams"][0]
+    if team:
         team_id = team.get("idTeam", "")
         team_name = team.get("strTeam", "")
         league = team.get("strLeague", "")
@@ -412,36 +154,8 @@ def get_team_details(team_name):
         # Important: Get the direct URL to the team's page on TheSportsDB
         team_url = f"https://www.thesportsdb.com/team/{team_id}-{team_name.lower().replace(' ', '-')}"
         
-        # First try to get logo from TheSportsDB API
-        logo_url = team.get("strTeamBadge", "")
-        
-        # If no logo found, try another field
-        if not logo_url:
-            logo_url = team.get("strTeamLogo", "")
-            
-        # If still no logo, try strTeamJersey as some teams have this
-        if not logo_url:
-            logo_url = team.get("strTeamJersey", "")
-            
-        # If API doesn't provide a logo, fall back to our custom database
-        if not logo_url:
-            logo_url = get_team_logo(team_name, league)
-        
-        # If we still don't have a logo, try direct TheSportsDB URL format
-        if not logo_url:
-            # This is a common format TheSportsDB uses
-            direct_url = f"https://www.thesportsdb.com/images/media/team/badge/{team_id}.png"
-            try:
-                headers = {"User-Agent": "Mozilla/5.0"}
-                response = requests.head(direct_url, timeout=1, headers=headers)
-                if response.status_code == 200:
-                    logo_url = direct_url
-            except:
-                pass
-        
-        # If still no logo, try dynamic logo generation
-        if not logo_url:
-            logo_url = generate_team_logo_url(team_name, league, team_id)
+        # Resolved logos are stored per team, so this is usually a local read
+        logo_url = resolve_team_logo(team)
         
         return {
             "team": team_name,
@@ -462,11 +176,9 @@ def advanced_team_search(team_name):
     """Try to find teams that might not match exact search"""
     # Try search with just the first word (for teams like "Philadelphia Eagles")
     first_word = team_name.split()[0] if team_name and ' ' in team_name else team_name
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/searchteams.php?t={first_word}"
     
     try:
-        response = requests.get(url)
-        data = response.json()
+        data = fetch_sportsdb("searchteams.php", t=first_word)
         
         if data.get("teams") and len(data["teams"]) > 0:
             # Look for a team that contains our search string
@@ -480,15 +192,7 @@ def advanced_team_search(team_name):
                     league = team.get("strLeague", "")
                     team_url = f"https://www.thesportsdb.com/team/{team_id}-{team_name.lower().replace(' ', '-')}"
                     
-                    logo_url = team.get("strTeamBadge", "")
-                    if not logo_url:
-                        logo_url = team.get("strTeamLogo", "")
-                    if not logo_url:
-                        logo_url = team.get("strTeamJersey", "")
-                    if not logo_url:
-                        logo_url = get_team_logo(team_name, league)
-                    if not logo_url:
-                        logo_url = generate_team_logo_url(team_name, league, team_id)
+                    logo_url = resolve_team_logo(team)
                     
                     return {
                         "team": team_name,
@@ -507,6 +211,51 @@ def advanced_team_search(team_name):
     
     return None
 
+def find_logo_for_team(team):
+    """Work through every logo source for a TheSportsDB team record
+
+    Returns "" if the team has no logo, or None if probing candidate URLs was
+    inconclusive (e.g. the network was down) and it should be tried again.
+    """
+    team_name = team.get("strTeam", "")
+    league = team.get("strLeague", "")
+    
+    # First try to get logo from TheSportsDB API
+    logo_url = team.get("strTeamBadge", "")
+    
+    # If no logo found, try another field
+    if not logo_url:
+        logo_url = team.get("strTeamLogo", "")
+        
+    # If still no logo, try strTeamJersey as some teams have this
+    if not logo_url:
+        logo_url = team.get("strTeamJersey", "")
+        
+    # If API doesn't provide a logo, fall back to our custom database
+    if not logo_url:
+        logo_url = get_team_logo(team_name, league)
+    
+    # If still no logo, probe candidate URLs (the direct TheSportsDB badge URL is tried first)
+    if not logo_url:
+        return generate_team_logo_url(team_name, league, team.get("idTeam", ""))
+    
+    return logo_url
+
+def resolve_team_logo(team):
+    """Return a team's logo from the persistent logo store, resolving it only the first time"""
+    team_id = team.get("idTeam", "")
+    if not team_id:
+        return find_logo_for_team(team) or ""
+    
+    # Stale entries are still returned; they get re-checked in the background
+    logo_url = logo_store.get_logo(team_id, resolve=lambda: find_logo_for_team(team))
+    if logo_url is None:
+        logo_url = find_logo_for_team(team)
+        if logo_url is None:
+            return ""  # Inconclusive; resolve again next time rather than storing a miss
+        logo_store.set_logo(team_id, logo_url)
+    return logo_url
+
 def generate_team_logo_url(team_name, league, team_id):
     """Generate potential logo URLs based on team name and league patterns"""
     logo_urls = []
@@ -640,158 +389,386 @@ def generate_team_logo_url(team_name, league, team_id):
     # Generic ESPN pattern as fallback (works for many teams)
     logo_urls.append(f"https://a.espncdn.com/combiner/i?img=/i/teamlogos/teams/500/{team_name_clean}.png")
     
-    # Try each URL to see if it works
-    headers = {"User-Agent": "Mozilla/5.0"}
-    for url in logo_urls:
-        try:
-            response = requests.head(url, timeout=1, headers=headers)
-            if response.status_code == 200:
-                # Found a working URL
-                return url
-        except:
-            # If there's an error, just continue to the next URL
-            continue
-    
-    # If no URL works, return empty string
-    return ""
+    # Probe all candidates at once and take the first working URL in the order above
+    # ("" if all are dead, None if none could be confirmed before the deadline)
+    return first_live_url(logo_urls)
 
 def get_latest_results(team_id, limit=5):
-    """Get the team's most recent matches with validation"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/eventslast.php?id={team_id}"
-    response = requests.get(url)
-    data = response.json()
-    
-    results = []
-    
-    # Get team name for validation
-    team_name = get_team_name_from_id(team_id)
-    
-    if data and "results" in data and data["results"]:
-        valid_results_count = 0
-        
-        for event in data["results"]:
-            # Skip irrelevant results
-            if team_name:
-                if team_name.lower() not in event["strHomeTeam"].lower() and team_name.lower() not in event["strAwayTeam"].lower():
-                    continue
-            
-            results.append({
-                "date": event["dateEvent"],
-                "home_team": event["strHomeTeam"],
-                "away_team": event["strAwayTeam"],
-                "home_score": event["intHomeScore"],
-                "away_score": event["intAwayScore"],
-                "league": event["strLeague"]
-            })
-            
-            valid_results_count += 1
-            if valid_results_count >= limit:
-                break
-    
-    return results
+    """Get the team's most recent matches from the local store"""
+    ensure_team_synced(team_id)
+    return sports_db.latest_results(team_id, limit)
 
 def get_upcoming_matches(team_id, limit=3):
-    """Get the team's upcoming fixtures with validation to ensure relevance"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/eventsnext.php?id={team_id}"
-    response = requests.get(url)
-    data = response.json()
-    
-    fixtures = []
-    
-    # First get the team name to validate fixtures
-    team_name = get_team_name_from_id(team_id)
-    
-    if data and "events" in data and data["events"]:
-        valid_fixtures_count = 0
-        
-        for event in data["events"]:
-            # Skip irrelevant fixtures by checking if our team is actually involved
-            if team_name:
-                if team_name.lower() not in event["strHomeTeam"].lower() and team_name.lower() not in event["strAwayTeam"].lower():
-                    continue
-            
-            fixtures.append({
-                "date": event["dateEvent"],
-                "time": event.get("strTime", "TBD"),
-                "home_team": event["strHomeTeam"],
-                "away_team": event["strAwayTeam"],
-                "venue": event["strVenue"],
-                "league": event["strLeague"]
-            })
-            
-            valid_fixtures_count += 1
-            if valid_fixtures_count >= limit:
-                break
-    
-    return fixtures
+    """Get the team's upcoming fixtures from the local store"""
+    ensure_team_synced(team_id)
+    return sports_db.upcoming_matches(team_id, limit)
+
+def get_team_record(team_id):
+    """Return the full team record for an ID, only calling lookupteam.php if it hasn't been seen"""
+    record = team_store.get_record(team_id)
+    if record is None:
+        data = fetch_sportsdb("lookupteam.php", id=team_id)
+        if data and "teams" in data and data["teams"]:
+            record = data["teams"][0]
+    return record
 
 def get_team_name_from_id(team_id):
     """Helper function to get team name from ID"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/lookupteam.php?id={team_id}"
     try:
-        response = requests.get(url)
-        data = response.json()
-        
-        if data and "teams" in data and data["teams"]:
-            return data["teams"][0].get("strTeam")
+        record = get_team_record(team_id)
+        if record:
+            return record.get("strTeam")
     except:
         pass
     
     return None
 
 def get_league_standings(league_id):
-    """Get current league standings"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/lookuptable.php?l={league_id}&s=2023-2024"
-    response = requests.get(url)
-    data = response.json()
-    
-    standings = []
-    if data and "table" in data and data["table"]:
-        for team in data["table"][:10]:  # Top 10 teams
-            standings.append({
-                "position": team["intRank"],
-                "team": team["strTeam"],
-                "played": team["intPlayed"],
-                "points": team["intPoints"]
-            })
-    return standings
+    """Get current league standings (top 10) from the local store"""
+    ensure_standings_synced(league_id)
+    return sports_db.league_standings(league_id, STANDINGS_SEASON, limit=10)
 
 def get_league_id(team_id):
     """Get league ID from team ID"""
-    url = f"https://www.thesportsdb.com/api/v1/json/{THESPORTSDB_API_KEY}/lookupteam.php?id={team_id}"
-    response = requests.get(url)
-    data = response.json()
-    
-    if data and "teams" in data and data["teams"]:
-        return data["teams"][0].get("idLeague")
+    record = get_team_record(team_id)
+    if record:
+        return record.get("idLeague")
     return None
 
-def generate_response(user_query, info_type="all"):
+def sync_team_events(team_id):
+    """Fetch a team's latest results and next fixtures into the store and schedule its next sync
+
+    Returns True if the team has a newer finished match than at its last sync.
+    """
+    team_name = get_team_name_from_id(team_id)
+    past = fetch_sportsdb("eventslast.php", fresh=True, id=team_id) or {}
+    upcoming = fetch_sportsdb("eventsnext.php", fresh=True, id=team_id) or {}
+    sports_db.save_events(past.get("results"), team_id, team_name)
+    sports_db.save_events(upcoming.get("events"), team_id, team_name)
+    
+    now = time.time()
+    stale_before = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now - STALE_FIXTURE_AGE))
+    watermark, next_start = sports_db.team_event_bounds(team_id, unfinished_since=stale_before)
+    
+    key = f"team:{team_id}"
+    previous = sports_db.get_sync_state(key)
+    sports_db.set_sync_state(key, watermark, next_team_sync_at(next_start, now))
+    live_feed.poll()
+    return previous is None or (previous["watermark"] or "") < watermark
+
+def next_team_sync_at(next_start, now):
+    """When to sync a team again, given the start of its earliest unfinished match ("" if none)"""
+    idle = now + SYNC_MAX_AGE
+    if not next_start:
+        return idle
+    kickoff = sports_db.start_epoch(next_start)
+    if now < kickoff:
+        return min(idle, kickoff)               # Nothing changes before kick-off
+    if now < kickoff + MATCH_DURATION:
+        return now + LIVE_POLL_INTERVAL         # In play: poll for score changes
+    return now + SYNC_MIN_INTERVAL              # Should be over: check until the result is posted
+
+def sync_standings(league_id, season=STANDINGS_SEASON):
+    """Fetch a league table into the store"""
+    data = fetch_sportsdb("lookuptable.php", fresh=True, l=league_id, s=season) or {}
+    sports_db.save_standings(league_id, season, data.get("table"))
+    sports_db.set_sync_state(f"standings:{league_id}:{season}", sports_db.league_watermark(league_id), time.time() + SYNC_MAX_AGE)
+
+def standings_due(league_id, season=STANDINGS_SEASON, now=None):
+    """True if a league table was never synced, is too old, or a league match finished since"""
+    state = sports_db.get_sync_state(f"standings:{league_id}:{season}")
+    if state is None:
+        return True
+    return state["due_at"] <= (now or time.time()) or sports_db.league_watermark(league_id) > (state["watermark"] or "")
+
+def ensure_team_synced(team_id):
+    """Make sure a team's events are in the store before reading them
+
+    Only a team's first request waits on upstream. After that the background
+    refresher keeps it current; without the refresher (e.g. the CLI) a due
+    team is synced inline.
+    """
+    state = sports_db.get_sync_state(f"team:{team_id}")
+    if state is None or (state["due_at"] <= time.time() and not store_refresher.running):
+        # Results and fixtures for the same team are requested together; sync once
+        sync_flight.do(f"team:{team_id}", lambda: sync_team_events(team_id))
+        if store_refresher.running:
+            store_refresher.wake()  # A newly tracked team may be due before anything else
+
+def ensure_standings_synced(league_id):
+    state = sports_db.get_sync_state(f"standings:{league_id}:{STANDINGS_SEASON}")
+    if state is None or (not store_refresher.running and standings_due(league_id)):
+        sync_flight.do(f"standings:{league_id}", lambda: sync_standings(league_id))
+
+def sync_store(track_all=False, force=False):
+    """Incremental sync: re-fetch teams whose sync is due, then tables of leagues with new results
+
+    track_all also starts tracking every stored team (e.g. after the league
+    prefetch); force re-syncs everything tracked regardless of watermarks.
+    """
+    now = time.time()
+    team_ids = {key.split(":", 1)[1] for key in sports_db.sync_keys("team:", None if force else now)}
+    if track_all:
+        tracked = {key.split(":", 1)[1] for key in sports_db.sync_keys("team:")}
+        team_ids |= {str(team["idTeam"]) for team in sports_db.load_teams()} - tracked
+    
+    summary = {"teams_synced": 0, "teams_changed": 0, "standings_synced": 0, "errors": 0}
+    for team_id in sorted(team_ids):
+        try:
+            changed = sync_team_events(team_id)
+        except Exception:
+            summary["errors"] += 1
+            sports_db.postpone_sync(f"team:{team_id}", now + SYNC_MIN_INTERVAL)
+            continue
+        summary["teams_synced"] += 1
+        summary["teams_changed"] += int(changed)
+    
+    for key in sports_db.sync_keys("standings:"):
+        _, league_id, season = key.split(":", 2)
+        if force or standings_due(league_id, season, now):
+            try:
+                sync_standings(league_id, season)
+                summary["standings_synced"] += 1
+            except Exception:
+                summary["errors"] += 1
+                sports_db.postpone_sync(key, now + SYNC_MIN_INTERVAL)
+    summary["store"] = sports_db.get_stats()
+    return summary
+
+# Runs sync_store() whenever the earliest team or league table falls due
+store_refresher = BackgroundRefresher(sync_store, sports_db.next_due_at, name="store-refresher")
+
+def start_background_refresh():
+    """Start the background refresher (once per process) so queries never wait on upstream"""
+    if BACKGROUND_REFRESH:
+        store_refresher.start()
+    return store_refresher
+
+def get_refresher_stats():
+    return store_refresher.get_stats()
+
+def live_events():
+    """Stored events in play (until their final status), just finished or about to start"""
+    now = time.time()
+    return sports_db.live_events(
+        recent_since=time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now - LIVE_WINDOW_BEFORE)),
+        in_play_since=time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now - STALE_FIXTURE_AGE)),
+        starts_before=time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now + LIVE_WINDOW_AFTER)),
+    )
+
+# Polled after every team sync, so score changes are published as soon as the refresher stores them
+live_feed = LiveScoreFeed(live_events)
+
+def get_live_scores():
+    """All live events and the feed position they reflect: {"seq", "events"}"""
+    if live_feed.stats["polls"] == 0:
+        live_feed.poll()
+    return live_feed.current()
+
+def get_live_score_deltas(seq):
+    """Score changes published after seq: {"seq", "deltas", "reset"}"""
+    return live_feed.since(seq)
+
+def prefetch_leagues(leagues=None):
+    """Load every team of the supported leagues into the team store, one request per league
+
+    Returns {league key: number of teams loaded}. Responses are kept in the
+    persistent TheSportsDB cache, so after a restart this is normally a local read.
+    """
+    loaded = {}
+    for key, league_name in (leagues or PREFETCH_LEAGUES).items():
+        try:
+            data = fetch_sportsdb("search_all_teams.php", l=league_name)
+        except Exception:
+            loaded[key] = 0
+            continue
+        loaded[key] = len(data.get("teams") or []) if isinstance(data, dict) else 0
+    return loaded
+
+def start_league_prefetch():
+    """Run prefetch_leagues() on a background thread (once per process)"""
+    global _prefetch_thread
+    if not PREFETCH_ENABLED:
+        return None
+    with _prefetch_lock:
+        if _prefetch_thread is None:
+            _prefetch_thread = threading.Thread(target=prefetch_leagues, name="league-prefetch", daemon=True)
+            _prefetch_thread.start()
+    return _prefetch_thread
+
+def get_team_store_stats():
+    """Return team store counters (name lookups served locally vs. missed)"""
+    return team_store.get_stats()
+
+# Async versions of the fetch functions. The blocking calls run on worker threads
+# (sharing the pooled HTTP client) so independent lookups can overlap.
+async def get_team_details_async(team_name):
+    return await asyncio.to_thread(get_team_details, team_name)
+
+async def get_latest_results_async(team_id, limit=5):
+    return await asyncio.to_thread(get_latest_results, team_id, limit)
+
+async def get_upcoming_matches_async(team_id, limit=3):
+    return await asyncio.to_thread(get_upcoming_matches, team_id, limit)
+
+async def get_league_id_async(team_id):
+    return await asyncio.to_thread(get_league_id, team_id)
+
+async def get_league_standings_async(league_id):
+    return await asyncio.to_thread(get_league_standings, league_id)
+
+async def fetch_team_snapshot(team_name, info_type="all"):
+    """Resolve a team, then fetch its results, fixtures and standings concurrently"""
+    details = await get_team_details_async(team_name)
+    if not details:
+        return None
+    team_id = details["team_id"]
+    
+    async def nothing():
+        return []
+    
+    async def league_and_standings():
+        league_id = await get_league_id_async(team_id)
+        standings = await get_league_standings_async(league_id) if league_id else []
+        return league_id, standings
+    
+    async def no_standings():
+        return None, []
+    
+    results, fixtures, (league_id, standings) = await asyncio.gather(
+        get_latest_results_async(team_id) if info_type in ("all", "results") else nothing(),
+        get_upcoming_matches_async(team_id) if info_type in ("all", "fixtures") else nothing(),
+        league_and_standings() if info_type in ("all", "standings") else no_standings()
+    )
+    
+    return {
+        "team_info": details,
+        "results": results,
+        "fixtures": fixtures,
+        "league_id": league_id,
+        "standings": standings
+    }
+
+def run_sync(coro):
+    """Run a coroutine from sync code, even if the calling thread already has an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+def get_team_snapshot(team_name, info_type="all"):
+    """Sync wrapper around fetch_team_snapshot for the CLI and Streamlit app"""
+    return run_sync(fetch_team_snapshot(team_name, info_type))
+
+class TeamContext:
+    """Everything fetched for one user query about a team, resolved once and shared
+    by the response generator and the UI"""
+    
+    def __init__(self, query, info_type, details, results, fixtures, league_id, standings):
+        self.query = query
+        self.info_type = info_type
+        self.details = details
+        self.results = results
+        self.fixtures = fixtures
+        self.league_id = league_id
+        self.standings = standings
+    
+    @property
+    def team_info(self):
+        """The get_team_info() view of the resolved team"""
+        return {
+            "team": self.details["team"],
+            "league": self.details["league"],
+            "stadium": self.details["stadium"],
+            "team_id": self.details["team_id"],
+            "logo": self.details.get("logo", "")
+        }
+    
+    def involves_team(self, match):
+        """Check whether a result/fixture actually involves this team"""
+        team_name = self.details["team"].lower()
+        return team_name in match["home_team"].lower() or team_name in match["away_team"].lower()
+
+def build_team_context(user_query, info_type="all"):
+    """Resolve the team and fetch what info_type needs, once per user query (None if no team matches)"""
+    snapshot = get_team_snapshot(user_query, info_type)
+    if not snapshot:
+        return None
+    return TeamContext(
+        user_query,
+        info_type,
+        snapshot["team_info"],
+        snapshot["results"],
+        snapshot["fixtures"],
+        snapshot["league_id"],
+        snapshot["standings"]
+    )
+
+def generate_response(user_query, info_type="all", context=None):
     """Generate a response to sports-related queries"""
     # Check if this is a team-specific query
-    team_info = get_team_info(user_query)
+    if context is None:
+        context = build_team_context(user_query, info_type)
     
-    if team_info:
+    if context:
         # Continue with existing team-specific logic
-        return generate_team_response(user_query, info_type)
+        return generate_team_response(user_query, info_type, context)
     else:
         # This is a general sports question
         return generate_general_sports_response(user_query)
 
-def generate_team_response(team_name, info_type="all"):
+def build_team_prompt(context, info_type="all"):
+    """Format the data in a TeamContext into a prompt for the LLM"""
+    info = context.details
+    sections = [f"Team: {info['team']}\nLeague: {info['league']}\nStadium: {info['stadium']}"]
+    
+    if info_type in ("all", "basic") and info.get("description"):
+        sections.append(f"About the team: {info['description'][:1500]}")
+    
+    if info_type in ("all", "results"):
+        lines = [f"- {r['date']}: {r['home_team']} {r['home_score']} - {r['away_score']} {r['away_team']}" for r in context.results]
+        sections.append("Latest results:\n" + ("\n".join(lines) if lines else "- No recent results found"))
+    
+    if info_type in ("all", "fixtures"):
+        lines = [f"- {f['date']} {f['time']}: {f['home_team']} vs {f['away_team']} at {f['venue']}" for f in context.fixtures]
+        sections.append("Upcoming fixtures:\n" + ("\n".join(lines) if lines else "- No upcoming fixtures found"))
+    
+    if info_type in ("all", "standings"):
+        lines = [f"{t['position']}. {t['team']} - {t['points']} points ({t['played']} games)" for t in context.standings]
+        sections.append("League standings:\n" + ("\n".join(lines) if lines else "No standings data found"))
+    
+    data = "\n\n".join(sections)
+    return f"""
+You are SportsChat, an AI sports announcer specializing in the NFL, NHL, MLB, NBA, and English Premier League.
+
+The user asked about: "{context.query}"
+
+Here is the latest data for this team:
+
+{data}
+
+Using only this data for scores, dates and standings, give the user a conversational, enthusiastic sports announcer style update. If some data is missing, say so briefly.
+"""
+
+def generate_team_response(team_name, info_type="all", context=None):
     """Get team info and pass it to Ollama for a conversational reply"""
-    team_info = get_team_info(team_name)
+    if context is None:
+        context = build_team_context(team_name, info_type)
     
-    if not team_info:
+    if not context:
         return "Sorry, I couldn't find that team."
     
-    # Rest of your existing team response code
-    # ...
+    prompt = build_team_prompt(context, info_type)
+    try:
+        return invoke_llm(prompt)
+    except LLMQueueFull:
+        return LLM_BUSY_MESSAGE
 
-def generate_general_sports_response(query):
-    """Generate response for general sports questions"""
-    # Format a prompt for the LLM with the user's query
-    prompt = f"""
+def build_general_sports_prompt(query):
+    """Format a prompt for the LLM with the user's query"""
+    return f"""
 You are SportsChat, an AI sports announcer specializing in the NFL, NHL, MLB, NBA, and English Premier League.
 
 The user has asked: "{query}"
@@ -807,12 +784,67 @@ Use a conversational, enthusiastic sports announcer style.
 
 Important: If the question is about a specific athlete, team, game, or sports record, provide detailed information about that specific topic. If you don't have enough information about a specific detail, acknowledge this limitation but still provide the general information you do know.
 """
+
+def lookup_cached_answer(query):
+    """Check the exact then the semantic answer cache; returns (answer or None, query embedding)"""
+    # Repeat questions (after normalisation) are answered from the exact cache
+    cached = answer_cache.get_answer(query)
+    if cached is not None:
+        return cached, None
+    
+    # Paraphrases of an answered question are caught by the semantic cache
+    vector = semantic_cache.embed(query) if semantic_cache.ENABLED else None
+    cached = semantic_cache.lookup(query, vector)
+    if cached is not None:
+        answer_cache.store_answer(query, cached)
+    return cached, vector
+
+def store_answer(query, answer, vector=None):
+    """Remember an LLM answer in both answer caches"""
+    answer_cache.store_answer(query, answer)
+    semantic_cache.store(query, answer, vector)
+
+def generate_general_sports_response(query):
+    """Generate response for general sports questions"""
+    cached, vector = lookup_cached_answer(query)
+    if cached is not None:
+        return cached
+    
+    prompt = build_general_sports_prompt(query)
     
     # Pass to the LLM
-    response = llm.invoke(prompt)
+    try:
+        response = invoke_llm(prompt)
+    except LLMQueueFull:
+        return LLM_BUSY_MESSAGE
+    store_answer(query, response, vector)
     return response
 
+def stream_general_sports_response(query):
+    """Yield the answer to a general sports question token by token as the LLM generates it"""
+    cached, vector = lookup_cached_answer(query)
+    if cached is not None:
+        yield cached
+        return
+    
+    prompt = build_general_sports_prompt(query)
+    chunks = []
+    try:
+        for chunk in stream_llm(prompt):
+            chunks.append(chunk)
+            yield chunk
+    except LLMQueueFull:
+        yield LLM_BUSY_MESSAGE
+        return
+    
+    # Only cache answers that streamed to completion
+    store_answer(query, "".join(chunks), vector)
+
 if __name__ == "__main__":
+    # Start loading the model in Ollama and the league teams while the user picks an option
+    warm_up_llm()
+    start_league_prefetch()
+    
     print("SportsChat - Real-time sports updates")
     print("1. Team Information")
     print("2. Latest Results")
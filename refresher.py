@@ -0,0 +1,81 @@
+import time
+import threading
+
+
+class BackgroundRefresher:
+    """Background thread that runs a sync whenever something is due, sleeping until the next due time
+
+    next_due() returns the earliest epoch time anything needs syncing (or None
+    if nothing is tracked); sync_due() syncs whatever is due. wake() makes the
+    thread re-check right away, e.g. after a new team starts being tracked.
+    """
+
+    def __init__(self, sync_due, next_due, name="refresher", min_sleep=1.0, max_sleep=300.0, error_backoff=30.0):
+        self.sync_due = sync_due
+        self.next_due = next_due
+        self.name = name
+        self.min_sleep = min_sleep
+        self.max_sleep = max_sleep
+        self.error_backoff = error_backoff
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {"runs": 0, "errors": 0, "wakeups": 0, "last_run_at": None, "next_due_at": None}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the thread (once); returns it"""
+        with self._lock:
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self):
+        self.stats["wakeups"] += 1
+        self._wake.set()
+
+    def _sleep(self, seconds):
+        self._wake.wait(max(self.min_sleep, min(seconds, self.max_sleep)))
+        self._wake.clear()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                due_at = self.next_due()
+            except Exception:
+                self.stats["errors"] += 1
+                self._sleep(self.error_backoff)
+                continue
+            self.stats["next_due_at"] = due_at
+            now = time.time()
+            if due_at is None or due_at > now:
+                self._sleep(self.max_sleep if due_at is None else due_at - now)
+                continue
+
+            try:
+                self.sync_due()
+            except Exception:
+                self.stats["errors"] += 1
+                self._sleep(self.error_backoff)
+                continue
+            self.stats["runs"] += 1
+            self.stats["last_run_at"] = time.time()
+            # Don't spin if whatever was due is still due (e.g. upstream keeps failing)
+            self._sleep(self.min_sleep)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["running"] = self.running
+        return stats
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import threading
+
+import tracing
+from answer_cache import question_ttl
+from ttl_cache import CACHE_DIR
+
+EMBED_MODEL = os.getenv("SPORTSCHAT_EMBED_MODEL", "nomic-embed-text")
+SIMILARITY_THRESHOLD = float(os.getenv("SPORTSCHAT_SEMANTIC_THRESHOLD", "0.92"))
+CAPACITY = int(os.getenv("SPORTSCHAT_SEMANTIC_CAPACITY", "2000"))
+ENABLED = os.getenv("SPORTSCHAT_SEMANTIC_CACHE", "1") != "0"
+EMBED_RETRY_AFTER = 60  # Back off this long after the embedding model fails
+
+INDEX_DIR = os.path.join(CACHE_DIR, "semantic")
+
+
+class SemanticIndex:
+    """Cosine-similarity index of answered questions, memory-mapped from disk
+
+    Vectors live in a fixed-capacity float32 file (one normalised row per slot)
+    and question/answer metadata in a JSON sidecar. New entries are appended
+    to the next free slot; once full, the least recently used slot is reused.
+    """
+
+    def __init__(self, directory=INDEX_DIR, capacity=CAPACITY):
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.entries_path = os.path.join(directory, "entries.json")
+        self.capacity = capacity
+        self.dim = None
+        self.vectors = None
+        self.entries = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.entries_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("capacity") != self.capacity or not os.path.exists(self.vectors_path):
+            return
+        import numpy as np
+
+        self.dim = saved["dim"]
+        self.entries = saved["entries"]
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+
+    def _create(self, dim):
+        import numpy as np
+
+        os.makedirs(os.path.dirname(self.vectors_path) or ".", exist_ok=True)
+        self.dim = dim
+        self.entries = []
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="w+", shape=(self.capacity, dim))
+
+    def _save_entries(self):
+        tmp_path = f"{self.entries_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"capacity": self.capacity, "dim": self.dim, "entries": self.entries}, f)
+        os.replace(tmp_path, self.entries_path)
+
+    def search(self, vector):
+        """Return (similarity, entry) for the closest live entry, or (0.0, None)"""
+        import numpy as np
+
+        with self._lock:
+            if self.vectors is None or not self.entries or len(vector) != self.dim:
+                return 0.0, None
+            similarities = self.vectors[:len(self.entries)] @ vector
+            now = time.time()
+            for slot in np.argsort(similarities)[::-1][:5]:
+                entry = self.entries[slot]
+                if entry["expires_at"] > now:
+                    entry["last_used"] = now
+                    return float(similarities[slot]), entry
+            return 0.0, None
+
+    def add(self, vector, question, answer, ttl):
+        """Append an entry, reusing an expired or least recently used slot when full"""
+        with self._lock:
+            if self.vectors is None or len(vector) != self.dim:
+                self._create(len(vector))
+            now = time.time()
+            entry = {"question": question, "answer": answer, "expires_at": now + ttl, "last_used": now}
+            if len(self.entries) < self.capacity:
+                slot = len(self.entries)
+                self.entries.append(entry)
+            else:
+                slot = min(range(len(self.entries)), key=lambda i: (self.entries[i]["expires_at"] > now, self.entries[i]["last_used"]))
+                self.entries[slot] = entry
+            self.vectors[slot] = vector
+            self.vectors.flush()
+            self._save_entries()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_index = None
+_embeddings = None
+_embed_failed_at = 0.0
+_init_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "embed_errors": 0}
+
+
+def _get_index():
+    global _index
+    if _index is None:
+        with _init_lock:
+            if _index is None:
+                _index = SemanticIndex()
+    return _index
+
+
+def embed(text):
+    """Embed text with the local Ollama embedding model, returning a unit vector (None on failure)"""
+    global _embeddings, _embed_failed_at
+    if time.time() - _embed_failed_at < EMBED_RETRY_AFTER:
+        return None
+    # numpy and langchain_ollama are only imported once a question needs embedding
+    import numpy as np
+
+    try:
+        if _embeddings is None:
+            from langchain_ollama import OllamaEmbeddings
+            _embeddings = OllamaEmbeddings(model=EMBED_MODEL)
+        with tracing.span("llm", "embed", model=EMBED_MODEL):
+            vector = np.asarray(_embeddings.embed_query(text), dtype=np.float32)
+    except Exception:
+        _embed_failed_at = time.time()
+        _stats["embed_errors"] += 1
+        return None
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def lookup(question, vector=None):
+    """Return a stored answer for a question similar enough to this one, or None"""
+    if not ENABLED:
+        return None
+    if vector is None:
+        vector = embed(question)
+    if vector is None:
+        return None
+    similarity, entry = _get_index().search(vector)
+    if entry is not None and similarity >= SIMILARITY_THRESHOLD:
+        _stats["hits"] += 1
+        return entry["answer"]
+    _stats["misses"] += 1
+    return None
+
+
+def store(question, answer, vector=None):
+    """Add an answered question to the index"""
+    if not ENABLED or not answer:
+        return
+    if vector is None:
+        vector = embed(question)
+    if vector is not None:
+        _get_index().add(vector, question, answer, question_ttl(question))
+
+
+def get_stats():
+    """Return hit/miss counters and the number of indexed questions"""
+    stats = dict(_stats)
+    stats["entries"] = len(_get_index())
+    stats["threshold"] = SIMILARITY_THRESHOLD
+    return stats
@@ -0,0 +1,421 @@
+"""Local SQLite store of teams, events and standings.
+
+main.py reads results, fixtures and standings from here instead of calling
+TheSportsDB on every query; main.sync_store() keeps it up to date by
+re-fetching only what may have changed since the last sync watermark:
+
+    teams      full team records, indexed by league
+    events     past and scheduled matches, indexed by team and league with start time
+    standings  league table rows per league and season
+    sync_state per team / per league table: watermark, when it was synced, when it is due again
+
+Run an incremental sync from the command line with:
+
+    python sports_db.py sync [--all] [--force]
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+from ttl_cache import CACHE_DIR
+
+DB_PATH = os.path.join(CACHE_DIR, "sportschat.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id    TEXT PRIMARY KEY,
+    league_id  TEXT,
+    name       TEXT,
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS teams_by_league ON teams (league_id);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id     TEXT PRIMARY KEY,
+    league_id    TEXT,
+    home_team_id TEXT,
+    away_team_id TEXT,
+    home_team    TEXT,
+    away_team    TEXT,
+    starts_at    TEXT,   -- ISO 8601 UTC
+    date         TEXT,
+    time         TEXT,
+    venue        TEXT,
+    league       TEXT,
+    home_score   TEXT,
+    away_score   TEXT,
+    status       TEXT,   -- TheSportsDB strStatus, e.g. "NS", "1H", "HT", "FT"
+    finished     INTEGER NOT NULL DEFAULT 0,  -- is_finished(): a final status, not just a score
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_home_team ON events (home_team_id, starts_at);
+CREATE INDEX IF NOT EXISTS events_by_away_team ON events (away_team_id, starts_at);
+CREATE INDEX IF NOT EXISTS events_by_league ON events (league_id, starts_at);
+
+CREATE TABLE IF NOT EXISTS standings (
+    league_id  TEXT NOT NULL,
+    season     TEXT NOT NULL,
+    position   INTEGER,
+    team_id    TEXT NOT NULL,
+    team       TEXT,
+    played     TEXT,
+    points     TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (league_id, season, team_id)
+);
+CREATE INDEX IF NOT EXISTS standings_by_position ON standings (league_id, season, position);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key       TEXT PRIMARY KEY,  -- "team:<id>" or "standings:<league id>:<season>"
+    watermark TEXT,              -- start time of the newest finished event seen
+    synced_at REAL,
+    due_at    REAL               -- when this entry should be synced again
+);
+"""
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"reads": 0, "writes": 0}
+
+
+def connect():
+    """Return this thread's connection to the store, creating the database on first use"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        import sqlite3  # Kept off the startup path with the other on-first-use imports
+
+        os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")  # Readers never wait for the syncing writer
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        _local.conn = conn
+    return conn
+
+
+def _migrate(conn):
+    """Add columns introduced after a database was created"""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(events)")}
+    if "status" not in columns:
+        with _write_lock, conn:
+            conn.execute("ALTER TABLE events ADD COLUMN status TEXT")
+    if "finished" not in columns:
+        statuses = ", ".join(f"'{status}'" for status in FINISHED_STATUSES)
+        with _write_lock, conn:
+            conn.execute("ALTER TABLE events ADD COLUMN finished INTEGER NOT NULL DEFAULT 0")
+            conn.execute(
+                "UPDATE events SET finished = 1 WHERE home_score IS NOT NULL "
+                f"AND (status IS NULL OR status = '' OR UPPER(status) IN ({statuses}))"
+            )
+
+
+def _read(sql, params=()):
+    with _stats_lock:
+        _stats["reads"] += 1
+    return connect().execute(sql, params).fetchall()
+
+
+def _write(sql, rows):
+    conn = connect()
+    with _write_lock, conn:
+        conn.executemany(sql, rows)
+    with _stats_lock:
+        _stats["writes"] += 1
+
+
+def event_start(event):
+    """ISO UTC start time of a TheSportsDB event ("" if it has no date)"""
+    timestamp = event.get("strTimestamp")
+    if timestamp:
+        return timestamp.replace(" ", "T")[:19]
+    if not event.get("dateEvent"):
+        return ""
+    event_time = (event.get("strTime") or "00:00:00")[:8]
+    return f"{event['dateEvent']}T{event_time if len(event_time) == 8 else '00:00:00'}"
+
+
+def start_epoch(starts_at):
+    """Epoch seconds for an ISO UTC start time from event_start()"""
+    import calendar
+
+    return calendar.timegm(time.strptime(starts_at, "%Y-%m-%dT%H:%M:%S"))
+
+
+def has_score(event):
+    return event.get("intHomeScore") not in (None, "")
+
+
+# strStatus values (upper-cased) of matches that are over; anything else with a
+# status ("1H", "HT", "Q3", "NS", "PST", ...) is still to be played or in play
+FINISHED_STATUSES = ("FT", "AET", "PEN", "AOT", "AP", "MATCH FINISHED", "FINISHED", "FINAL")
+
+
+# strStatus values (upper-cased) of matches that haven't kicked off or won't be played
+NOT_STARTED_STATUSES = ("NS", "TBD", "NOT STARTED", "PST", "POSTPONED", "CANC", "CANCELLED", "ABD", "SUSP")
+
+
+def in_play(status, finished):
+    """True if a stored event's status says it is being played right now"""
+    status = (status or "").strip().upper()
+    return bool(status) and not finished and status not in NOT_STARTED_STATUSES
+
+
+def is_finished(event):
+    """True if a TheSportsDB event is over: a final strStatus, or a score with no status at all
+
+    A score alone isn't enough, since in-play matches carry the score so far.
+    """
+    status = (event.get("strStatus") or "").strip().upper()
+    if status:
+        return status in FINISHED_STATUSES
+    return has_score(event)
+
+
+# --- teams ---
+
+def save_teams(teams):
+    """Upsert full team records from any TheSportsDB team response"""
+    now = time.time()
+    rows = [
+        (str(team["idTeam"]), team.get("idLeague"), team.get("strTeam"), json.dumps(team), now)
+        for team in teams or [] if team.get("idTeam")
+    ]
+    if rows:
+        _write("INSERT OR REPLACE INTO teams (team_id, league_id, name, data, updated_at) VALUES (?, ?, ?, ?, ?)", rows)
+
+
+def load_teams():
+    """Return every stored team record"""
+    return [json.loads(row["data"]) for row in _read("SELECT data FROM teams")]
+
+
+# --- events ---
+
+def save_events(events, team_id=None, team_name=None):
+    """Upsert events; ones fetched for a team get its id filled in when TheSportsDB left it out"""
+    now = time.time()
+    name = (team_name or "").lower()
+    rows = []
+    for event in events or []:
+        if not event.get("idEvent"):
+            continue
+        home_id, away_id = event.get("idHomeTeam"), event.get("idAwayTeam")
+        if team_id and name and not home_id and name in (event.get("strHomeTeam") or "").lower():
+            home_id = team_id
+        if team_id and name and not away_id and name in (event.get("strAwayTeam") or "").lower():
+            away_id = team_id
+        rows.append((
+            str(event["idEvent"]), event.get("idLeague"), home_id, away_id,
+            event.get("strHomeTeam"), event.get("strAwayTeam"), event_start(event),
+            event.get("dateEvent"), event.get("strTime") or "TBD", event.get("strVenue"), event.get("strLeague"),
+            event.get("intHomeScore") if has_score(event) else None,
+            event.get("intAwayScore") if has_score(event) else None,
+            event.get("strStatus"),
+            int(is_finished(event)),
+            now,
+        ))
+    if rows:
+        _write(
+            "INSERT OR REPLACE INTO events (event_id, league_id, home_team_id, away_team_id, home_team, away_team, "
+            "starts_at, date, time, venue, league, home_score, away_score, status, finished, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def latest_results(team_id, limit=5):
+    """The team's most recent finished matches, newest first"""
+    rows = _read(
+        "SELECT * FROM events WHERE home_team_id = ? AND finished = 1 "
+        "UNION SELECT * FROM events WHERE away_team_id = ? AND finished = 1 "
+        "ORDER BY starts_at DESC LIMIT ?",
+        (str(team_id), str(team_id), limit),
+    )
+    return [
+        {
+            "date": row["date"],
+            "home_team": row["home_team"],
+            "away_team": row["away_team"],
+            "home_score": row["home_score"],
+            "away_score": row["away_score"],
+            "league": row["league"],
+        }
+        for row in rows
+    ]
+
+
+def upcoming_matches(team_id, limit=3, now=None):
+    """The team's next scheduled matches that haven't finished, soonest first"""
+    today = time.strftime("%Y-%m-%d", time.gmtime(now or time.time()))
+    rows = _read(
+        "SELECT * FROM events WHERE home_team_id = ? AND finished = 0 AND date >= ? "
+        "UNION SELECT * FROM events WHERE away_team_id = ? AND finished = 0 AND date >= ? "
+        "ORDER BY starts_at ASC LIMIT ?",
+        (str(team_id), today, str(team_id), today, limit),
+    )
+    return [
+        {
+            "date": row["date"],
+            "time": row["time"],
+            "home_team": row["home_team"],
+            "away_team": row["away_team"],
+            "venue": row["venue"],
+            "league": row["league"],
+        }
+        for row in rows
+    ]
+
+
+def live_events(recent_since, in_play_since, starts_before):
+    """Events for the live score feed, keyed by event id (times are ISO UTC)
+
+    Matches whose status says they are in play are included until a final
+    status arrives (as long as they started after in_play_since); others only
+    if they start between recent_since and starts_before, so just-finished
+    matches keep showing their final score.
+    """
+    rows = _read(
+        "SELECT * FROM events WHERE starts_at >= ? AND starts_at <= ? ORDER BY starts_at",
+        (min(recent_since, in_play_since), starts_before),
+    )
+    return {
+        row["event_id"]: {
+            "event_id": row["event_id"],
+            "starts_at": row["starts_at"],
+            "home_team": row["home_team"],
+            "away_team": row["away_team"],
+            "home_score": row["home_score"],
+            "away_score": row["away_score"],
+            "status": row["status"],
+            "in_play": in_play(row["status"], row["finished"]),
+            "league": row["league"],
+        }
+        for row in rows
+        if row["starts_at"] >= recent_since or in_play(row["status"], row["finished"])
+    }
+
+
+def team_event_bounds(team_id, unfinished_since=""):
+    """(start of the newest finished event, start of the earliest unfinished event) for a team
+
+    Unfinished events that started before unfinished_since (e.g. postponed
+    matches that never got a result) are ignored.
+    """
+    team_id = str(team_id)
+    latest = _read(
+        "SELECT MAX(starts_at) AS latest FROM events "
+        "WHERE (home_team_id = ? OR away_team_id = ?) AND finished = 1",
+        (team_id, team_id),
+    )[0]["latest"]
+    upcoming = _read(
+        "SELECT MIN(starts_at) AS upcoming FROM events "
+        "WHERE (home_team_id = ? OR away_team_id = ?) AND finished = 0 AND starts_at != '' AND starts_at >= ?",
+        (team_id, team_id, unfinished_since),
+    )[0]["upcoming"]
+    return latest or "", upcoming or ""
+
+
+def league_watermark(league_id):
+    """Start of the newest finished event stored for a league"""
+    rows = _read("SELECT MAX(starts_at) AS latest FROM events WHERE league_id = ? AND finished = 1", (str(league_id),))
+    return rows[0]["latest"] or ""
+
+
+# --- standings ---
+
+def save_standings(league_id, season, table):
+    """Replace a league's table for a season"""
+    now = time.time()
+    rows = [
+        (str(league_id), season, int(row["intRank"]) if str(row.get("intRank") or "").isdigit() else None,
+         str(row.get("idTeam") or row.get("strTeam")), row.get("strTeam"), row.get("intPlayed"), row.get("intPoints"), now)
+        for row in table or []
+    ]
+    conn = connect()
+    with _write_lock, conn:
+        conn.execute("DELETE FROM standings WHERE league_id = ? AND season = ?", (str(league_id), season))
+        conn.executemany(
+            "INSERT OR REPLACE INTO standings (league_id, season, position, team_id, team, played, points, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    with _stats_lock:
+        _stats["writes"] += 1
+
+
+def league_standings(league_id, season, limit=10):
+    rows = _read(
+        "SELECT * FROM standings WHERE league_id = ? AND season = ? ORDER BY position LIMIT ?",
+        (str(league_id), season, limit),
+    )
+    return [
+        {"position": str(row["position"]), "team": row["team"], "played": row["played"], "points": row["points"]}
+        for row in rows
+    ]
+
+
+# --- sync state ---
+
+def get_sync_state(key):
+    """Return {"watermark", "synced_at", "due_at"} for a sync key, or None if never synced"""
+    rows = _read("SELECT watermark, synced_at, due_at FROM sync_state WHERE key = ?", (key,))
+    return dict(rows[0]) if rows else None
+
+
+def set_sync_state(key, watermark, due_at):
+    _write(
+        "INSERT OR REPLACE INTO sync_state (key, watermark, synced_at, due_at) VALUES (?, ?, ?, ?)",
+        [(key, watermark, time.time(), due_at)],
+    )
+
+
+def postpone_sync(key, due_at):
+    """Move a sync key's due time without touching its watermark (e.g. after a failed sync)"""
+    _write("UPDATE sync_state SET due_at = ? WHERE key = ?", [(due_at, key)])
+
+
+def next_due_at():
+    """Earliest due time over all sync keys, or None if nothing is tracked"""
+    return _read("SELECT MIN(due_at) AS due_at FROM sync_state")[0]["due_at"]
+
+
+def sync_keys(prefix, due_before=None):
+    """Sync keys with a prefix, optionally only those due before a time"""
+    if due_before is None:
+        rows = _read("SELECT key FROM sync_state WHERE key LIKE ?", (prefix + "%",))
+    else:
+        rows = _read("SELECT key FROM sync_state WHERE key LIKE ? AND due_at <= ?", (prefix + "%", due_before))
+    return [row["key"] for row in rows]
+
+
+def clear():
+    """Delete everything in the store"""
+    conn = connect()
+    with _write_lock, conn:
+        for table in ("teams", "events", "standings", "sync_state"):
+            conn.execute(f"DELETE FROM {table}")
+
+
+def get_stats():
+    """Return read/write counters and row counts per table"""
+    with _stats_lock:
+        stats = dict(_stats)
+    for table in ("teams", "events", "standings", "sync_state"):
+        stats[table] = _read(f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
+    return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "sync":
+        print(__doc__)
+        sys.exit(1)
+    import main as sports_app
+
+    summary = sports_app.sync_store(track_all="--all" in sys.argv, force="--force" in sys.argv)
+    print(json.dumps(summary, indent=2))
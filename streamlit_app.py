@@ -1,13 +1,57 @@
 import streamlit as st
+from streamlit.runtime import get_instance
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import main as sports_app
-import requests
+import logo_assets
+import llm_queue
+import tracing
+from chat_history import ChatHistory
+
+# Messages shown at first and added per "Show older messages" click
+CHAT_PAGE_SIZE = 10
 
 # Initialize session state for chat history if it doesn't exist
 if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = ChatHistory()
+if "chat_visible" not in st.session_state:
+    st.session_state.chat_visible = CHAT_PAGE_SIZE
 
 st.set_page_config(page_title="SportsChat", page_icon="🏆", layout="wide")
 
+# Load the LLM into Ollama in the background once per server process
+@st.cache_resource
+def start_llm_warmup():
+    return sports_app.warm_up_llm()
+
+start_llm_warmup()
+
+# Load all teams of the supported leagues in the background once per server process
+@st.cache_resource
+def start_league_prefetch():
+    return sports_app.start_league_prefetch()
+
+# Keep tracked teams' results, fixtures and tables fresh in the background
+@st.cache_resource
+def start_background_refresh():
+    return sports_app.start_background_refresh()
+
+start_background_refresh()
+
+start_league_prefetch()
+
+# Serve Prometheus metrics on SPORTSCHAT_METRICS_PORT (if set) once per server process
+@st.cache_resource
+def start_metrics_server():
+    return tracing.start_metrics_server()
+
+start_metrics_server()
+
+# Queued LLM jobs from this session are dropped if the browser session goes away
+script_ctx = get_script_run_ctx()
+if script_ctx:
+    session_id = script_ctx.session_id
+    llm_queue.bind_liveness_check(lambda: get_instance().is_active_session(session_id))
+
 # Update the title and description
 st.title("SportsChat 🏆")
 st.write("Your AI sports assistant for NFL, NBA, MLB, NHL and Premier League. Ask about teams, players, records, or any sports trivia!")
@@ -41,6 +85,45 @@ with st.expander("About SportsChat"):
     SportsChat uses real-time data for team information and LLM capabilities to answer general sports questions from its knowledge base.
     """)
 
+# Re-runs on its own on this interval, redrawing only the live score widget
+LIVE_SCORES_REFRESH = "15s"
+
+def format_score(event):
+    if event["home_score"] is None:
+        return "vs"
+    return f"{event['home_score']} - {event['away_score']}"
+
+@st.fragment(run_every=LIVE_SCORES_REFRESH)
+def live_scores_widget():
+    """Live scores for tracked teams, kept current by applying only the feed's new deltas"""
+    state = st.session_state
+    if "live_scores" not in state:
+        feed = {"reset": True}
+    else:
+        feed = sports_app.get_live_score_deltas(state.live_seq)
+    if feed["reset"]:
+        snapshot = sports_app.get_live_scores()
+        state.live_scores = {event["event_id"]: event for event in snapshot["events"]}
+        state.live_seq = snapshot["seq"]
+    else:
+        for delta in feed["deltas"]:
+            event = delta["event"]
+            if delta["type"] == "removed":
+                state.live_scores.pop(delta["event_id"], None)
+                continue
+            state.live_scores[delta["event_id"]] = event
+            if delta["type"] == "score":
+                st.toast(f"{event['home_team']} {format_score(event)} {event['away_team']}", icon="⚡")
+        state.live_seq = feed["seq"]
+    
+    st.header("Live Scores")
+    if not state.live_scores:
+        st.caption("No matches in play for the teams you've asked about.")
+    for event in sorted(state.live_scores.values(), key=lambda event: event["starts_at"]):
+        status = f" ({event['status']})" if event.get("status") else ""
+        live = "🔴 " if event.get("in_play") else ""
+        st.markdown(f"{live}{event['home_team']} **{format_score(event)}** {event['away_team']}{status}")
+
 # Sidebar for options
 with st.sidebar:
     st.header("Information Type")
@@ -175,7 +258,7 @@ with st.sidebar:
         full_team_name = teams_for_league[selected_nickname]
         
         # Get logo URL
-        team_logo = sports_app.get_team_logo(full_team_name)
+        team_logo = sports_app.get_team_logo(full_team_name, selected_league)
         
         # Display logo and team name
         st.write("Selected Team:")
@@ -184,7 +267,8 @@ with st.sidebar:
         cols = st.columns([1, 3])
         with cols[0]:
             if team_logo:
-                st.image(team_logo, width=70)
+                # Serve a pre-sized local copy; fall back to the remote URL if it can't be mirrored
+                st.image(logo_assets.get_thumbnail(team_logo, 70) or team_logo, width=70)
             else:
                 sport_icon = get_sport_icon(selected_league)
                 st.markdown(f"<h1 style='font-size: 2.5rem; margin: 0;'>{sport_icon}</h1>", unsafe_allow_html=True)
@@ -196,10 +280,14 @@ with st.sidebar:
         if st.button("Get Info About This Team"):
             st.session_state.team_input = full_team_name
     
+    st.markdown("<hr>", unsafe_allow_html=True)
+    live_scores_widget()
+    
     # Keep the Clear Chat History button at the bottom
     st.markdown("<hr>", unsafe_allow_html=True)
     if st.button("Clear Chat History"):
-        st.session_state.chat_history = []
+        st.session_state.chat_history.clear()
+        st.session_state.chat_visible = CHAT_PAGE_SIZE
         st.session_state.team_input = ""
 
 info_map = {
@@ -228,36 +316,74 @@ def get_sport_icon(league_name):
     else:
         return "🏆"
 
-# Display chat history with logos or sport-specific icons
+def add_assistant_message(content, logo, league):
+    """Add an answer to the chat history, resolving its logo thumbnail once instead of on every render"""
+    entry = {
+        "role": "assistant",
+        "content": content,
+        "logo": logo,
+        "thumbnail": (logo_assets.get_thumbnail(logo, 200) or logo) if logo else "",
+        "league": league
+    }
+    st.session_state.chat_history.append(entry)
+    return entry
+
+def render_raw_data(sections):
+    """Raw data sections saved on an answer: {"label", "json"} or {"label", "lines"}"""
+    with st.expander("Raw Data"):
+        for section in sections:
+            st.write(section["label"])
+            if "json" in section:
+                st.json(section["json"])
+            else:
+                for line in section["lines"]:
+                    st.write(f"- {line}")
+
+def render_message(entry):
+    if entry["role"] == "user":
+        st.markdown(f"**You:** {entry['content']}")
+        st.markdown("---")
+        return
+    col1, col2 = st.columns([2, 8])  # Changed from [1, 10] to [2, 8] to give more space for the logo
+    with col1:
+        if entry.get("thumbnail"):
+            try:
+                st.image(entry["thumbnail"], width=200)
+            except Exception as e:
+                # If logo doesn't load, use sport-specific icon based on league
+                icon = get_sport_icon(entry.get("league", ""))
+                # Make the emoji larger too
+                st.markdown(f"<h1 style='font-size: 8rem; margin: 0;'>{icon}</h1>", unsafe_allow_html=True)
+                # Optional: add debug comment for understanding why it failed
+                st.markdown(f"<!-- Logo failed: {str(e)} -->", unsafe_allow_html=True)
+        else:
+            # No logo, display a generic sports icon
+            st.markdown("<h1 style='font-size: 4rem; margin: 0;'>🏆</h1>", unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"**SportsChat:** {entry['content']}")
+    if entry.get("warning"):
+        st.warning(entry["warning"])
+    if entry.get("raw_data"):
+        render_raw_data(entry["raw_data"])
+    st.markdown("---")
+
+# Display the most recent chat messages with logos or sport-specific icons; older
+# ones are loaded a page at a time on demand, re-running only this fragment
+def show_older_messages():
+    st.session_state.chat_visible += CHAT_PAGE_SIZE
+
+@st.fragment
+def chat_history_view():
+    history = st.session_state.chat_history
+    hidden = len(history) - st.session_state.chat_visible
+    if hidden > 0:
+        st.button(f"Show older messages ({hidden} more)", on_click=show_older_messages)
+    for entry in history.tail(st.session_state.chat_visible):
+        render_message(entry)
+
 chat_container = st.container()
 with chat_container:
-    for entry in st.session_state.chat_history:
-        if entry["role"] == "user":
-            st.markdown(f"**You:** {entry['content']}")
-            st.markdown("---")
-        else:
-            col1, col2 = st.columns([2, 8])  # Changed from [1, 10] to [2, 8] to give more space for the logo
-            with col1:
-                if "logo" in entry and entry["logo"]:
-                    try:
-                        # Add headers to avoid some blocking issues
-                        headers = {"User-Agent": "Mozilla/5.0"}
-                        # Increase logo size from 50 to 100 pixels
-                        st.image(entry["logo"], width=200)
-                    except Exception as e:
-                        # If logo doesn't load, use sport-specific icon based on league
-                        league = entry.get("league", "") if "league" in entry else ""
-                        icon = get_sport_icon(league)
-                        # Make the emoji larger too
-                        st.markdown(f"<h1 style='font-size: 8rem; margin: 0;'>{icon}</h1>", unsafe_allow_html=True)
-                        # Optional: add debug comment for understanding why it failed
-                        st.markdown(f"<!-- Logo failed: {str(e)} -->", unsafe_allow_html=True)
-                else:
-                    # No logo, display a generic sports icon
-                    st.markdown("<h1 style='font-size: 4rem; margin: 0;'>🏆</h1>", unsafe_allow_html=True)
-            with col2:
-                st.markdown(f"**SportsChat:** {entry['content']}")
-            st.markdown("---")
+    chat_history_view()
 
 # Handle user input
 if "team_input" not in st.session_state:
@@ -305,19 +431,22 @@ if submit_button and team_name:
     question_words = ["who", "what", "when", "where", "why", "how", "which", "can", "did", "does", "is", "are", "will"]
     is_question = team_name.lower().split()[0] in question_words or team_name.endswith('?') or len(team_name.split()) > 5
     
-    # Add user query to chat history
+    # Add user query to chat history and go back to showing just the latest messages
+    st.session_state.chat_visible = CHAT_PAGE_SIZE
     st.session_state.chat_history.append({
         "role": "user",
         "content": team_name
     })
     
-    # Initialize team_info to None before the if/else branches
+    # Initialize team_info/team_context to None before the if/else branches
     team_info = None
+    team_context = None
     
-    with st.spinner(f"Getting information..."):
+    # Every HTTP and LLM call made for this query is recorded as a span in its trace
+    with st.spinner(f"Getting information..."), tracing.trace_query(team_name) as trace:
         if is_question:
-            # This is likely a general sports question
-            response = sports_app.generate_general_sports_response(team_name)
+            # This is likely a general sports question; show the answer as it is generated
+            response = st.write_stream(sports_app.stream_general_sports_response(team_name))
             
             # Add generic sport logo based on the question content
             sport_type = "unknown"
@@ -336,91 +465,72 @@ if submit_button and team_name:
             league_name = sport_type
             
             # Add response to chat history
-            st.session_state.chat_history.append({
-                "role": "assistant",
-                "content": response,
-                "logo": logo_url,
-                "league": league_name
-            })
+            entry = add_assistant_message(response, logo_url, league_name)
         else:
-            # Original team-based flow
-            team_info = sports_app.get_team_info(team_name)
+            # Original team-based flow: resolve the team and its data once for this query
+            team_context = sports_app.build_team_context(team_name, info_map[info_type])
+            team_info = team_context.team_info if team_context else None
             logo_url = team_info.get("logo", "") if team_info else ""
             
             if team_info:
                 # Generate response and add to chat history as before
-                response = sports_app.generate_response(team_name, info_map[info_type])
+                response = sports_app.generate_response(team_name, info_map[info_type], context=team_context)
                 
                 # Add response to chat history with logo and league info
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "logo": logo_url,
-                    "league": team_info.get("league", "")
-                })
+                entry = add_assistant_message(response, logo_url, team_info.get("league", ""))
             else:
                 # Handle case where team is not found but it's not detected as a question
                 # Try generating a general response instead
-                response = sports_app.generate_general_sports_response(team_name)
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "logo": "",
-                    "league": "unknown"
-                })
+                response = st.write_stream(sports_app.stream_general_sports_response(team_name))
+                entry = add_assistant_message(response, "", "unknown")
         
         # After adding the response to the chat history
         # Only check for fixtures if team_info exists
+        raw_data = []
         if team_info:
             # Check if there's at least one relevant fixture
-            has_relevant_fixtures = False
             if info_type in ["All Information", "Upcoming Fixtures"]:
-                fixtures = sports_app.get_upcoming_matches(team_info["team_id"])
-                for fixture in fixtures:
-                    if (team_info["team"].lower() in fixture["home_team"].lower() or 
-                        team_info["team"].lower() in fixture["away_team"].lower()):
-                        has_relevant_fixtures = True
-                        break
+                fixtures = team_context.fixtures
+                has_relevant_fixtures = any(team_context.involves_team(fixture) for fixture in fixtures)
                 
                 if not has_relevant_fixtures and fixtures:
-                    st.warning(f"⚠️ Some fixtures shown may not be relevant to {team_info['team']}. TheSportsDB API sometimes returns generic fixtures when team-specific data is unavailable.")
+                    entry["warning"] = f"⚠️ Some fixtures shown may not be relevant to {team_info['team']}. TheSportsDB API sometimes returns generic fixtures when team-specific data is unavailable."
         
-            # Show raw data in expandable section, but only if team_info exists
-            with st.expander("Raw Data"):
-                st.write("Team Info:")
-                st.json(team_info)
-                
-                if info_type in ["All Information", "Latest Results"]:
-                    results = sports_app.get_latest_results(team_info["team_id"])
-                    st.write("Latest Results:")
-                    st.json(results)
-                    
-                    # Debug to check for team name consistency
-                    team_name_val = team_info["team"]
-                    st.write(f"Checking if results are relevant to {team_name_val}:")
-                    for result in results:
-                        is_relevant = (team_name_val.lower() in result["home_team"].lower() or 
-                                      team_name_val.lower() in result["away_team"].lower())
-                        st.write(f"- {result['home_team']} vs {result['away_team']}: {'✅' if is_relevant else '❌'}")
+            # Raw data is saved on the answer and shown under it, but only if team_info exists
+            # (everything here comes from the context built above, no extra API calls)
+            raw_data.append({"label": "Team Info:", "json": team_info})
+            team_name_val = team_info["team"]
+            
+            if info_type in ["All Information", "Latest Results"]:
+                results = team_context.results
+                raw_data.append({"label": "Latest Results:", "json": results})
                 
-                if info_type in ["All Information", "Upcoming Fixtures"]:
-                    fixtures = sports_app.get_upcoming_matches(team_info["team_id"])
-                    st.write("Upcoming Fixtures:")
-                    st.json(fixtures)
-                    
-                    # Debug to check for team name consistency
-                    st.write(f"Checking if fixtures are relevant to {team_name_val}:")
-                    for fixture in fixtures:
-                        is_relevant = (team_name_val.lower() in fixture["home_team"].lower() or 
-                                      team_name_val.lower() in fixture["away_team"].lower())
-                        st.write(f"- {fixture['home_team']} vs {fixture['away_team']}: {'✅' if is_relevant else '❌'}")
+                # Debug to check for team name consistency
+                raw_data.append({
+                    "label": f"Checking if results are relevant to {team_name_val}:",
+                    "lines": [f"{result['home_team']} vs {result['away_team']}: {'✅' if team_context.involves_team(result) else '❌'}"
+                              for result in results],
+                })
+            
+            if info_type in ["All Information", "Upcoming Fixtures"]:
+                fixtures = team_context.fixtures
+                raw_data.append({"label": "Upcoming Fixtures:", "json": fixtures})
                 
-                if info_type in ["All Information", "League Standings"]:
-                    league_id = sports_app.get_league_id(team_info["team_id"])
-                    if league_id:
-                        standings = sports_app.get_league_standings(league_id)
-                        st.write(f"League Standings (ID: {league_id}):")
-                        st.json(standings)
+                # Debug to check for team name consistency
+                raw_data.append({
+                    "label": f"Checking if fixtures are relevant to {team_name_val}:",
+                    "lines": [f"{fixture['home_team']} vs {fixture['away_team']}: {'✅' if team_context.involves_team(fixture) else '❌'}"
+                              for fixture in fixtures],
+                })
+            
+            if info_type in ["All Information", "League Standings"]:
+                league_id = team_context.league_id
+                if league_id:
+                    raw_data.append({"label": f"League Standings (ID: {league_id}):", "json": team_context.standings})
+    
+    # The trace is complete once the query's context has exited
+    raw_data.append({"label": f"Trace {trace.trace_id}:", "json": trace.to_dict()})
+    entry["raw_data"] = raw_data
     
     # Rerun to update the chat display
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,443 @@
+import re
+from functools import lru_cache
+
+# Official team logo URLs, grouped by league so names that exist in more than
+# one league never overwrite each other
+LEAGUE_LOGOS = {
+    "EPL": {  # Premier League (all 20 teams)
+        "arsenal": "https://resources.premierleague.com/premierleague/badges/t3.svg",
+        "aston villa": "https://resources.premierleague.com/premierleague/badges/t7.svg",
+        "bournemouth": "https://resources.premierleague.com/premierleague/badges/t91.svg",
+        "brentford": "https://resources.premierleague.com/premierleague/badges/t94.svg",
+        "brighton": "https://resources.premierleague.com/premierleague/badges/t36.svg",
+        "burnley": "https://resources.premierleague.com/premierleague/badges/t90.svg",
+        "chelsea": "https://resources.premierleague.com/premierleague/badges/t8.svg",
+        "crystal palace": "https://resources.premierleague.com/premierleague/badges/t31.svg",
+        "everton": "https://resources.premierleague.com/premierleague/badges/t11.svg",
+        "fulham": "https://resources.premierleague.com/premierleague/badges/t54.svg",
+        "ipswich": "https://resources.premierleague.com/premierleague/badges/t52.svg",
+        "leicester": "https://resources.premierleague.com/premierleague/badges/t13.svg",
+        "liverpool": "https://resources.premierleague.com/premierleague/badges/t14.svg",
+        "luton": "https://resources.premierleague.com/premierleague/badges/t102.svg",
+        "manchester city": "https://resources.premierleague.com/premierleague/badges/t43.svg",
+        "manchester united": "https://resources.premierleague.com/premierleague/badges/t1.svg",
+        "newcastle": "https://resources.premierleague.com/premierleague/badges/t4.svg",
+        "newcastle united": "https://resources.premierleague.com/premierleague/badges/t4.svg",
+        "nottingham forest": "https://resources.premierleague.com/premierleague/badges/t17.svg",
+        "sheffield united": "https://resources.premierleague.com/premierleague/badges/t49.svg",
+        "southampton": "https://resources.premierleague.com/premierleague/badges/t20.svg",
+        "tottenham": "https://resources.premierleague.com/premierleague/badges/t6.svg",
+        "tottenham hotspur": "https://resources.premierleague.com/premierleague/badges/t6.svg",
+        "west ham": "https://resources.premierleague.com/premierleague/badges/t21.svg",
+        "west ham united": "https://resources.premierleague.com/premierleague/badges/t21.svg",
+        "wolves": "https://resources.premierleague.com/premierleague/badges/t39.svg",
+        "wolverhampton": "https://resources.premierleague.com/premierleague/badges/t39.svg",
+        "wolverhampton wanderers": "https://resources.premierleague.com/premierleague/badges/t39.svg",
+    },
+    "NBA": {  # NBA (all 30 teams)
+        "atlanta hawks": "https://cdn.nba.com/logos/nba/1610612737/global/L/logo.svg",
+        "boston celtics": "https://cdn.nba.com/logos/nba/1610612738/global/L/logo.svg",
+        "brooklyn nets": "https://cdn.nba.com/logos/nba/1610612751/global/L/logo.svg",
+        "charlotte hornets": "https://cdn.nba.com/logos/nba/1610612766/global/L/logo.svg",
+        "chicago bulls": "https://cdn.nba.com/logos/nba/1610612741/global/L/logo.svg",
+        "cleveland cavaliers": "https://cdn.nba.com/logos/nba/1610612739/global/L/logo.svg",
+        "dallas mavericks": "https://cdn.nba.com/logos/nba/1610612742/global/L/logo.svg",
+        "denver nuggets": "https://cdn.nba.com/logos/nba/1610612743/global/L/logo.svg",
+        "detroit pistons": "https://cdn.nba.com/logos/nba/1610612765/global/L/logo.svg",
+        "golden state warriors": "https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg",
+        "houston rockets": "https://cdn.nba.com/logos/nba/1610612745/global/L/logo.svg",
+        "indiana pacers": "https://cdn.nba.com/logos/nba/1610612754/global/L/logo.svg",
+        "la clippers": "https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg",
+        "los angeles clippers": "https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg",
+        "los angeles lakers": "https://cdn.nba.com/logos/nba/1610616839/global/L/logo.svg",
+        "memphis grizzlies": "https://cdn.nba.com/logos/nba/1610612763/global/L/logo.svg",
+        "miami heat": "https://cdn.nba.com/logos/nba/1610612748/global/L/logo.svg",
+        "milwaukee bucks": "https://cdn.nba.com/logos/nba/1610612749/global/L/logo.svg",
+        "minnesota timberwolves": "https://cdn.nba.com/logos/nba/1610612750/global/L/logo.svg",
+        "new orleans pelicans": "https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg",
+        "new york knicks": "https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg",
+        "oklahoma city thunder": "https://cdn.nba.com/logos/nba/1610612760/global/L/logo.svg",
+        "orlando magic": "https://cdn.nba.com/logos/nba/1610612753/global/L/logo.svg",
+        "philadelphia 76ers": "https://cdn.nba.com/logos/nba/1610612755/global/L/logo.svg",
+        "phoenix suns": "https://cdn.nba.com/logos/nba/1610612756/global/L/logo.svg",
+        "portland trail blazers": "https://cdn.nba.com/logos/nba/1610612757/global/L/logo.svg",
+        "sacramento kings": "https://cdn.nba.com/logos/nba/1610612758/global/L/logo.svg",
+        "san antonio spurs": "https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg",
+        "toronto raptors": "https://cdn.nba.com/logos/nba/1610612761/global/L/logo.svg",
+        "utah jazz": "https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg",
+        "washington wizards": "https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg",
+    },
+    "NFL": {  # NFL (all 32 teams)
+        "arizona cardinals": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/ARI",
+        "atlanta falcons": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/ATL",
+        "baltimore ravens": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/BAL",
+        "buffalo bills": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/BUF",
+        "carolina panthers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CAR",
+        "chicago bears": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CHI",
+        "cincinnati bengals": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CIN",
+        "cleveland browns": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/CLE",
+        "dallas cowboys": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DAL",
+        "denver broncos": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DEN",
+        "detroit lions": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/DET",
+        "green bay packers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/GB",
+        "houston texans": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/HOU",
+        "indianapolis colts": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/IND",
+        "jacksonville jaguars": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/JAX",
+        "kansas city chiefs": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/KC",
+        "las vegas raiders": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LV",
+        "los angeles chargers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LAC",
+        "los angeles rams": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/LA",
+        "miami dolphins": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/MIA",
+        "minnesota vikings": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/MIN",
+        "new england patriots": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NE",
+        "new orleans saints": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NO",
+        "new york giants": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NYG",
+        "new york jets": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/NYJ",
+        "philadelphia eagles": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/PHI",
+        "pittsburgh steelers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/PIT",
+        "san francisco 49ers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/SF",
+        "seattle seahawks": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/SEA",
+        "tampa bay buccaneers": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/TB",
+        "tennessee titans": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/TEN",
+        "washington commanders": "https://static.www.nfl.com/t_q-best/league/api/clubs/logos/WAS",
+    },
+    "MLB": {  # MLB (all 30 teams)
+        "arizona diamondbacks": "https://www.mlbstatic.com/team-logos/team-cap-on-light/109.svg",
+        "atlanta braves": "https://www.mlbstatic.com/team-logos/team-cap-on-light/144.svg",
+        "baltimore orioles": "https://www.mlbstatic.com/team-logos/team-cap-on-light/110.svg",
+        "boston red sox": "https://www.mlbstatic.com/team-logos/team-cap-on-light/111.svg",
+        "chicago cubs": "https://www.mlbstatic.com/team-logos/team-cap-on-light/112.svg",
+        "chicago white sox": "https://www.mlbstatic.com/team-logos/team-cap-on-light/145.svg",
+        "cincinnati reds": "https://www.mlbstatic.com/team-logos/team-cap-on-light/113.svg",
+        "cleveland guardians": "https://www.mlbstatic.com/team-logos/team-cap-on-light/114.svg",
+        "colorado rockies": "https://www.mlbstatic.com/team-logos/team-cap-on-light/115.svg",
+        "detroit tigers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/116.svg",
+        "houston astros": "https://www.mlbstatic.com/team-logos/team-cap-on-light/117.svg",
+        "kansas city royals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/118.svg",
+        "los angeles angels": "https://www.mlbstatic.com/team-logos/team-cap-on-light/108.svg",
+        "los angeles dodgers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/119.svg",
+        "miami marlins": "https://www.mlbstatic.com/team-logos/team-cap-on-light/146.svg",
+        "milwaukee brewers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/158.svg",
+        "minnesota twins": "https://www.mlbstatic.com/team-logos/team-cap-on-light/142.svg",
+        "new york mets": "https://www.mlbstatic.com/team-logos/team-cap-on-light/121.svg",
+        "new york yankees": "https://www.mlbstatic.com/team-logos/team-cap-on-light/147.svg",
+        "oakland athletics": "https://www.mlbstatic.com/team-logos/team-cap-on-light/133.svg",
+        "philadelphia phillies": "https://www.mlbstatic.com/team-logos/team-cap-on-light/143.svg",
+        "pittsburgh pirates": "https://www.mlbstatic.com/team-logos/team-cap-on-light/134.svg",
+        "san diego padres": "https://www.mlbstatic.com/team-logos/team-cap-on-light/135.svg",
+        "san francisco giants": "https://www.mlbstatic.com/team-logos/team-cap-on-light/137.svg",
+        "seattle mariners": "https://www.mlbstatic.com/team-logos/team-cap-on-light/136.svg",
+        "st. louis cardinals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/138.svg",
+        "tampa bay rays": "https://www.mlbstatic.com/team-logos/team-cap-on-light/139.svg",
+        "texas rangers": "https://www.mlbstatic.com/team-logos/team-cap-on-light/140.svg",
+        "toronto blue jays": "https://www.mlbstatic.com/team-logos/team-cap-on-light/141.svg",
+        "washington nationals": "https://www.mlbstatic.com/team-logos/team-cap-on-light/120.svg",
+    },
+    "NHL": {  # NHL (all 32 teams)
+        "anaheim ducks": "https://assets.nhle.com/logos/nhl/svg/ANA_light.svg",
+        "arizona coyotes": "https://assets.nhle.com/logos/nhl/svg/ARI_light.svg",
+        "boston bruins": "https://assets.nhle.com/logos/nhl/svg/BOS_light.svg",
+        "buffalo sabres": "https://assets.nhle.com/logos/nhl/svg/BUF_light.svg",
+        "calgary flames": "https://assets.nhle.com/logos/nhl/svg/CGY_light.svg",
+        "carolina hurricanes": "https://assets.nhle.com/logos/nhl/svg/CAR_light.svg",
+        "chicago blackhawks": "https://assets.nhle.com/logos/nhl/svg/CHI_light.svg",
+        "colorado avalanche": "https://assets.nhle.com/logos/nhl/svg/COL_light.svg",
+        "columbus blue jackets": "https://assets.nhle.com/logos/nhl/svg/CBJ_light.svg",
+        "dallas stars": "https://assets.nhle.com/logos/nhl/svg/DAL_light.svg",
+        "detroit red wings": "https://assets.nhle.com/logos/nhl/svg/DET_light.svg",
+        "edmonton oilers": "https://assets.nhle.com/logos/nhl/svg/EDM_light.svg",
+        "florida panthers": "https://assets.nhle.com/logos/nhl/svg/FLA_light.svg",
+        "los angeles kings": "https://assets.nhle.com/logos/nhl/svg/LAK_light.svg",
+        "minnesota wild": "https://assets.nhle.com/logos/nhl/svg/MIN_light.svg",
+        "montreal canadiens": "https://assets.nhle.com/logos/nhl/svg/MTL_light.svg",
+        "nashville predators": "https://assets.nhle.com/logos/nhl/svg/NSH_light.svg",
+        "new jersey devils": "https://assets.nhle.com/logos/nhl/svg/NJD_light.svg",
+        "new york islanders": "https://assets.nhle.com/logos/nhl/svg/NYI_light.svg",
+        "new york rangers": "https://assets.nhle.com/logos/nhl/svg/NYR_light.svg",
+        "ottawa senators": "https://assets.nhle.com/logos/nhl/svg/OTT_light.svg",
+        "philadelphia flyers": "https://assets.nhle.com/logos/nhl/svg/PHI_light.svg",
+        "pittsburgh penguins": "https://assets.nhle.com/logos/nhl/svg/PIT_light.svg",
+        "san jose sharks": "https://assets.nhle.com/logos/nhl/svg/SJS_light.svg",
+        "seattle kraken": "https://assets.nhle.com/logos/nhl/svg/SEA_light.svg",
+        "st. louis blues": "https://assets.nhle.com/logos/nhl/svg/STL_light.svg",
+        "tampa bay lightning": "https://assets.nhle.com/logos/nhl/svg/TBL_light.svg",
+        "toronto maple leafs": "https://assets.nhle.com/logos/nhl/svg/TOR_light.svg",
+        "utah hockey club": "https://assets.nhle.com/logos/nhl/svg/UTAH_light.svg",
+        "vancouver canucks": "https://assets.nhle.com/logos/nhl/svg/VAN_light.svg",
+        "vegas golden knights": "https://assets.nhle.com/logos/nhl/svg/VGK_light.svg",
+        "washington capitals": "https://assets.nhle.com/logos/nhl/svg/WSH_light.svg",
+        "winnipeg jets": "https://assets.nhle.com/logos/nhl/svg/WPG_light.svg",
+    },
+}
+
+LEAGUE_ALIASES = {
+    "MLB": {  # MLB
+        "diamondbacks": "arizona diamondbacks",
+        "d-backs": "arizona diamondbacks",
+        "sox": "boston red sox",  # Default to Red Sox, but this is ambiguous
+        "white sox": "chicago white sox",
+        "red sox": "boston red sox",
+        "guardians": "cleveland guardians",
+        "rockies": "colorado rockies",
+        "tigers": "detroit tigers",
+        "astros": "houston astros",
+        "royals": "kansas city royals",
+        "angels": "los angeles angels",
+        "dodgers": "los angeles dodgers",
+        "marlins": "miami marlins",
+        "brewers": "milwaukee brewers",
+        "twins": "minnesota twins",
+        "mets": "new york mets",
+        "yankees": "new york yankees",
+        "athletics": "oakland athletics",
+        "phillies": "philadelphia phillies",
+        "pirates": "pittsburgh pirates",
+        "padres": "san diego padres",
+        "giants": "san francisco giants",
+        "mariners": "seattle mariners",
+        "cardinals": "st. louis cardinals",
+        "rays": "tampa bay rays",
+        "rangers": "texas rangers",
+        "blue jays": "toronto blue jays",
+        "nationals": "washington nationals",
+    },
+    "NFL": {  # NFL
+        "cardinals": "arizona cardinals",
+        "falcons": "atlanta falcons",
+        "ravens": "baltimore ravens",
+        "bills": "buffalo bills",
+        "panthers": "carolina panthers",
+        "bears": "chicago bears",
+        "bengals": "cincinnati bengals",
+        "browns": "cleveland browns",
+        "cowboys": "dallas cowboys",
+        "broncos": "denver broncos",
+        "lions": "detroit lions",
+        "packers": "green bay packers",
+        "texans": "houston texans",
+        "colts": "indianapolis colts",
+        "jaguars": "jacksonville jaguars",
+        "chiefs": "kansas city chiefs",
+        "raiders": "las vegas raiders",
+        "chargers": "los angeles chargers",
+        "rams": "los angeles rams",
+        "dolphins": "miami dolphins",
+        "vikings": "minnesota vikings",
+        "patriots": "new england patriots",
+        "saints": "new orleans saints",
+        "giants": "new york giants",
+        "jets": "new york jets",
+        "eagles": "philadelphia eagles",
+        "philly": "philadelphia eagles",
+        "steelers": "pittsburgh steelers",
+        "niners": "san francisco 49ers",
+        "49ers": "san francisco 49ers",
+        "seahawks": "seattle seahawks",
+        "bucs": "tampa bay buccaneers",
+        "buccaneers": "tampa bay buccaneers",
+        "titans": "tennessee titans",
+        "commanders": "washington commanders",
+        "washington football team": "washington commanders",
+    },
+    "NBA": {  # NBA
+        "hawks": "atlanta hawks",
+        "celtics": "boston celtics",
+        "nets": "brooklyn nets",
+        "hornets": "charlotte hornets",
+        "bulls": "chicago bulls",
+        "cavaliers": "cleveland cavaliers",
+        "cavs": "cleveland cavaliers",
+        "mavs": "dallas mavericks",
+        "mavericks": "dallas mavericks",
+        "nuggets": "denver nuggets",
+        "pistons": "detroit pistons",
+        "warriors": "golden state warriors",
+        "rockets": "houston rockets",
+        "pacers": "indiana pacers",
+        "clippers": "los angeles clippers",
+        "lakers": "los angeles lakers",
+        "grizzlies": "memphis grizzlies",
+        "heat": "miami heat",
+        "bucks": "milwaukee bucks",
+        "timberwolves": "minnesota timberwolves",
+        "wolves": "minnesota timberwolves",
+        "pelicans": "new orleans pelicans",
+        "knicks": "new york knicks",
+        "thunder": "oklahoma city thunder",
+        "magic": "orlando magic",
+        "sixers": "philadelphia 76ers",
+        "76ers": "philadelphia 76ers",
+        "suns": "phoenix suns",
+        "blazers": "portland trail blazers",
+        "trail blazers": "portland trail blazers",
+        "kings": "sacramento kings",
+        "spurs": "san antonio spurs",
+        "raptors": "toronto raptors",
+        "jazz": "utah jazz",
+        "wizards": "washington wizards",
+    },
+    "NHL": {  # NHL
+        "ducks": "anaheim ducks",
+        "coyotes": "arizona coyotes",
+        "bruins": "boston bruins",
+        "sabres": "buffalo sabres",
+        "flames": "calgary flames",
+        "hurricanes": "carolina hurricanes",
+        "blackhawks": "chicago blackhawks",
+        "avalanche": "colorado avalanche",
+        "blue jackets": "columbus blue jackets",
+        "stars": "dallas stars",
+        "red wings": "detroit red wings",
+        "oilers": "edmonton oilers",
+        "panthers": "florida panthers",
+        "kings": "los angeles kings",
+        "wild": "minnesota wild",
+        "canadiens": "montreal canadiens",
+        "habs": "montreal canadiens",
+        "predators": "nashville predators",
+        "preds": "nashville predators",
+        "devils": "new jersey devils",
+        "islanders": "new york islanders",
+        "rangers": "new york rangers",
+        "senators": "ottawa senators",
+        "sens": "ottawa senators",
+        "flyers": "philadelphia flyers",
+        "penguins": "pittsburgh penguins",
+        "pens": "pittsburgh penguins",
+        "sharks": "san jose sharks",
+        "kraken": "seattle kraken",
+        "blues": "st. louis blues",
+        "lightning": "tampa bay lightning",
+        "bolts": "tampa bay lightning",
+        "maple leafs": "toronto maple leafs",
+        "leafs": "toronto maple leafs",
+        "canucks": "vancouver canucks",
+        "golden knights": "vegas golden knights",
+        "knights": "vegas golden knights",
+        "capitals": "washington capitals",
+        "caps": "washington capitals",
+        "jets": "winnipeg jets",
+    },
+    "EPL": {  # EPL
+        "gunners": "arsenal",
+        "villa": "aston villa",
+        "cherries": "bournemouth",
+        "bees": "brentford",
+        "seagulls": "brighton",
+        "clarets": "burnley",
+        "blues": "chelsea",
+        "eagles": "crystal palace",
+        "toffees": "everton",
+        "cottagers": "fulham",
+        "tractor boys": "ipswich",
+        "foxes": "leicester",
+        "reds": "liverpool",
+        "hatters": "luton",
+        "citizens": "manchester city",
+        "city": "manchester city",
+        "united": "manchester united",
+        "man utd": "manchester united",
+        "man united": "manchester united",
+        "man city": "manchester city",
+        "magpies": "newcastle united",
+        "forest": "nottingham forest",
+        "blades": "sheffield united",
+        "saints": "southampton",
+        "spurs": "tottenham hotspur",
+        "hammers": "west ham united",
+        "wanderers": "wolverhampton wanderers",
+    },
+}
+
+# Substrings that identify each league in names like "NBA", "English Premier League"
+# or the Streamlit labels such as "NFL (American Football)"
+LEAGUE_KEYWORDS = [
+    ("NFL", ["nfl", "american football"]),
+    ("NBA", ["nba", "basketball"]),
+    ("MLB", ["mlb", "baseball"]),
+    ("NHL", ["nhl", "hockey"]),
+    ("EPL", ["premier league", "epl", "soccer"]),
+]
+
+
+def normalize_name(name):
+    """Lower-case a team name and collapse its whitespace"""
+    return " ".join(name.lower().split()) if name else ""
+
+
+def league_key(league):
+    """Map a league label to one of the LEAGUE_LOGOS keys, or None if unknown"""
+    league_lower = league.lower() if league else ""
+    for key, keywords in LEAGUE_KEYWORDS:
+        if any(keyword in league_lower for keyword in keywords):
+            return key
+    return None
+
+
+def _tokens(name):
+    return [token for token in re.split(r"[\s.\-]+", name) if token]
+
+
+class LogoIndex:
+    """Alias map plus token/prefix index over one set of team names, built once"""
+
+    def __init__(self, logos, aliases):
+        self.logos = logos
+        self.aliases = aliases
+        self.order = {name: position for position, name in enumerate(logos)}
+        self.token_index = {}   # full token -> team names containing it
+        self.prefix_index = {}  # token prefix -> team names with a token starting with it
+        for name in logos:
+            for token in _tokens(name):
+                self.token_index.setdefault(token, set()).add(name)
+                for end in range(1, len(token) + 1):
+                    self.prefix_index.setdefault(token[:end], set()).add(name)
+
+    def lookup(self, name):
+        """Resolve a normalized name via alias, exact match, then partial match"""
+        name = self.aliases.get(name, name)
+        if name in self.logos:
+            return self.logos[name]
+
+        # Partial match: the query inside a team name, or a team name inside the query
+        tokens = _tokens(name)
+        if not tokens:
+            return ""
+        candidates = set(self.prefix_index.get(tokens[0], ()))
+        for token in tokens:
+            candidates |= self.token_index.get(token, set())
+        matches = [team for team in candidates if name in team or team in name]
+        if matches:
+            return self.logos[min(matches, key=self.order.__getitem__)]
+        return ""
+
+
+def _build_global_index():
+    logos = {}
+    aliases = {}
+    for league_logos in LEAGUE_LOGOS.values():
+        logos.update(league_logos)
+    # Without a league, later tables win for shared aliases, as before
+    for league_aliases in LEAGUE_ALIASES.values():
+        aliases.update(league_aliases)
+    return LogoIndex(logos, aliases)
+
+
+LEAGUE_INDEXES = {key: LogoIndex(LEAGUE_LOGOS[key], LEAGUE_ALIASES.get(key, {})) for key in LEAGUE_LOGOS}
+GLOBAL_INDEX = _build_global_index()
+
+
+@lru_cache(maxsize=4096)
+def find_team_logo(team_name, league=None):
+    """Return the logo URL for a team name, scoped to its league when one is given"""
+    name = normalize_name(team_name)
+    if not name:
+        return ""
+
+    key = league_key(league)
+    if key:
+        logo = LEAGUE_INDEXES[key].lookup(name)
+        if logo:
+            return logo
+
+    return GLOBAL_INDEX.lookup(name)
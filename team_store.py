@@ -0,0 +1,115 @@
+import threading
+
+import sports_db
+from team_logos import LEAGUE_ALIASES, normalize_name
+
+# In-process index of full TheSportsDB team records keyed by idTeam, backed by
+# the teams table in sports_db so known teams survive a restart
+_records = {}
+# Normalised full team name -> idTeam
+_names = {}
+# Normalised short / alternate name -> set of idTeam; only used when it names one team
+_other_names = {}
+_lock = threading.Lock()
+_loaded = False
+_stats = {"hits": 0, "misses": 0, "stored": 0, "name_hits": 0, "name_misses": 0}
+
+# Nicknames from the logo tables ("lakers") mapped to full team names. A
+# nickname used in more than one league ("eagles", "saints", "giants") is
+# left out so it falls through to an upstream search instead of guessing.
+_alias_targets = {}
+for _league_aliases in LEAGUE_ALIASES.values():
+    for _alias, _full_name in _league_aliases.items():
+        _alias_targets.setdefault(_alias, set()).add(_full_name)
+_AMBIGUOUS_ALIASES = {alias for alias, targets in _alias_targets.items() if len(targets) > 1}
+_ALIASES = {alias: targets.pop() for alias, targets in _alias_targets.items() if len(targets) == 1}
+del _alias_targets
+
+
+def _other_record_names(team):
+    names = [team.get("strTeamShort")]
+    names.extend((team.get("strTeamAlternate") or "").split(","))
+    return [normalize_name(name) for name in names if name and name.strip()]
+
+
+def _index(teams):
+    for team in teams:
+        team_id = str(team.get("idTeam") or "")
+        if team_id:
+            _records[team_id] = team
+            for name in _other_record_names(team):
+                _other_names.setdefault(name, set()).add(team_id)
+            if team.get("strTeam"):
+                _names[normalize_name(team.get("strTeam"))] = team_id
+            _stats["stored"] += 1
+
+
+def _ensure_loaded():
+    """Load the persisted teams the first time the store is used (call with _lock held)"""
+    global _loaded
+    if not _loaded:
+        _loaded = True
+        _index(sports_db.load_teams())
+
+
+def remember_teams(teams):
+    """Store every team record from a searchteams/lookupteam/search_all_teams response"""
+    if not teams:
+        return
+    sports_db.save_teams(teams)
+    with _lock:
+        _ensure_loaded()
+        _index(teams)
+
+
+def get_record(team_id):
+    """Return the stored team record for an id, or None"""
+    with _lock:
+        _ensure_loaded()
+        record = _records.get(str(team_id))
+        if record is None:
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+        return record
+
+
+def _unique_other_name(name):
+    if name in _AMBIGUOUS_ALIASES:
+        return None  # e.g. Crystal Palace's alternate name "Eagles"
+    team_ids = _other_names.get(name)
+    if team_ids and len(team_ids) == 1:
+        return next(iter(team_ids))
+    return None
+
+
+def find_team(team_name):
+    """Return the stored team record matching a name, short name, alternate name or nickname, or None"""
+    name = normalize_name(team_name)
+    with _lock:
+        _ensure_loaded()
+        team_id = _names.get(name) or _unique_other_name(name) or _names.get(_ALIASES.get(name, ""))
+        if team_id is None:
+            _stats["name_misses"] += 1
+            return None
+        _stats["name_hits"] += 1
+        return _records[team_id]
+
+
+def clear():
+    """Forget the in-memory index (the persisted teams are not reloaded)"""
+    global _loaded
+    with _lock:
+        _loaded = True
+        _records.clear()
+        _names.clear()
+        _other_names.clear()
+
+
+def get_stats():
+    """Return lookup counters and the number of teams and names held"""
+    with _lock:
+        stats = dict(_stats)
+        stats["teams"] = len(_records)
+        stats["names"] = len(_names) + len(_other_names)
+    return stats
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Settings are read when the app modules are imported, so they must be in place first:
+# TheSportsDB is replayed from tests/fixtures/http and nothing is cached outside a temp dir
+os.environ["SPORTSCHAT_HTTP_MODE"] = "replay"
+os.environ["SPORTSCHAT_FIXTURE_DIR"] = os.path.join(os.path.dirname(__file__), "fixtures", "http")
+os.environ["SPORTSCHAT_CACHE_DIR"] = tempfile.mkdtemp(prefix="sportschat-tests-")
+os.environ["SPORTSCHAT_LLM_WARMUP"] = "0"
+os.environ["SPORTSCHAT_SEMANTIC_CACHE"] = "0"
+os.environ["SPORTSCHAT_PREFETCH_LEAGUES"] = "0"
+os.environ["SPORTSCHAT_BACKGROUND_REFRESH"] = "0"
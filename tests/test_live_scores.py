@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+import main
+import sports_db
+from live_scores import LiveScoreFeed
+
+
+def iso(seconds_from_now):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() + seconds_from_now))
+
+
+def event(event_id, starts_at, status, home_score=None, away_score=None):
+    return {
+        "idEvent": event_id, "idLeague": "4328", "idHomeTeam": "133604", "idAwayTeam": "133610",
+        "strHomeTeam": "Arsenal", "strAwayTeam": "Chelsea", "strTimestamp": starts_at, "dateEvent": starts_at[:10],
+        "intHomeScore": home_score, "intAwayScore": away_score, "strStatus": status,
+    }
+
+
+@pytest.fixture
+def feed():
+    sports_db.clear()
+    feed = LiveScoreFeed(main.live_events)
+    feed.poll()
+    return feed
+
+
+def changes(deltas):
+    return [(d["type"], d["event"]["home_score"], d["event"]["away_score"], d["event"]["status"]) for d in deltas]
+
+
+def test_scored_match_keeps_publishing_until_full_time(feed):
+    kickoff = iso(-1800)
+    sports_db.save_events([event("1", kickoff, "1H", "1", "0")])
+    assert changes(feed.poll()) == [("new", "1", "0", "1H")]
+
+    sports_db.save_events([event("1", kickoff, "1H", "2", "0")])
+    assert changes(feed.poll()) == [("score", "2", "0", "1H")]
+
+    sports_db.save_events([event("1", kickoff, "HT", "2", "0")])
+    sports_db.save_events([event("1", kickoff, "FT", "2", "1")])
+    assert changes(feed.poll()) == [("score", "2", "1", "FT")]
+    assert feed.poll() == []
+
+
+def test_in_play_is_decided_by_status(feed):
+    sports_db.save_events([
+        event("1", iso(-8 * 3600), "ET", "1", "1"),   # Long delayed, still being played
+        event("2", iso(-8 * 3600), "FT", "0", "2"),   # Finished long ago
+        event("3", iso(3600), "NS"),
+    ])
+    events = {d["event_id"]: d["event"] for d in feed.poll()}
+    assert sorted(events) == ["1", "3"]
+    assert events["1"]["in_play"] and not events["3"]["in_play"]
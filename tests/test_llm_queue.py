@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from llm_queue import LLMJobQueue, LLMQueueFull, LLMJobCancelled
+
+
+def blocking_job(started, release):
+    def fn(job):
+        started.set()
+        release.wait(5)
+        return "first"
+    return fn
+
+
+@pytest.fixture
+def busy_queue():
+    """A one-worker queue whose worker is held by a job until release is set"""
+    queue = LLMJobQueue(workers=1, max_depth=1)
+    started, release = threading.Event(), threading.Event()
+    first = queue.submit(blocking_job(started, release))
+    assert started.wait(5)
+    yield queue, first, release
+    release.set()
+
+
+def test_full_queue_rejects(busy_queue):
+    queue, first, release = busy_queue
+    queue.submit(lambda job: "waiting")
+    with pytest.raises(LLMQueueFull):
+        queue.submit(lambda job: "rejected")
+    assert queue.get_stats()["rejected"] == 1
+    release.set()
+    assert first.wait(5) == "first"
+
+
+def test_cancel_before_start_never_runs(busy_queue):
+    queue, first, release = busy_queue
+    ran = threading.Event()
+    job = queue.submit(lambda job: ran.set())
+    job.cancel()
+    release.set()
+    with pytest.raises(LLMJobCancelled):
+        job.wait(5)
+    assert not ran.is_set()
+    assert queue.get_stats()["cancelled"] == 1
+
+
+def test_dead_session_is_dropped(busy_queue):
+    queue, first, release = busy_queue
+    ran = threading.Event()
+    job = queue.submit(lambda job: ran.set(), is_alive=lambda: False)
+    release.set()
+    with pytest.raises(LLMJobCancelled):
+        job.wait(5)
+    assert not ran.is_set()
+
+
+def test_stream_stops_when_consumer_exits_early():
+    queue = LLMJobQueue(workers=1, max_depth=4)
+    emitted = []
+    consumer_left = threading.Event()
+
+    def stream(job):
+        for i in range(1000):
+            if i == 1:
+                consumer_left.wait(5)
+            if not job.emit(str(i)):
+                break
+            emitted.append(i)
+        return "".join(map(str, emitted))
+
+    job = queue.submit(stream)
+    chunks = job.iter_chunks()
+    assert next(chunks) == "0"
+    chunks.close()
+    consumer_left.set()
+    job.wait(5)
+    assert job.cancelled
+    assert emitted == [0]
+
+
+def test_results_and_errors_reach_the_caller():
+    queue = LLMJobQueue(workers=2, max_depth=4)
+    assert queue.submit(lambda job: 42).wait(5) == 42
+
+    def fail(job):
+        raise ValueError("model missing")
+
+    with pytest.raises(ValueError):
+        queue.submit(fail).wait(5)
+    stats = queue.get_stats()
+    assert (stats["completed"], stats["failed"]) == (1, 1)
@@ -0,0 +1,64 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+import http_replay
+import logo_probe
+import logo_store
+import main
+
+
+class LogoHandler(BaseHTTPRequestHandler):
+    statuses = {"/ok.png": 200, "/moved.png": 302, "/gone.png": 404, "/error.png": 503}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.server.hits.append(self.path)
+        status = self.statuses[self.path]
+        self.send_response(status)
+        if status == 302:
+            self.send_header("Location", "/ok.png")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # Probes go to this local server through a real (non-replay) probe session
+    monkeypatch.setattr(http_replay, "get_adapter_class", lambda: None)
+    monkeypatch.setattr(http_client, "_probe_session", http_client._new_session(0))
+    logo_probe.dead_urls.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LogoHandler)
+    server.hits = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+
+
+def test_probe_outcomes(server):
+    base, _ = server
+    assert logo_probe.probe_url(f"{base}/ok.png") is True
+    assert logo_probe.probe_url(f"{base}/moved.png") is True
+    assert logo_probe.probe_url(f"{base}/gone.png") is False
+    assert logo_probe.probe_url(f"{base}/error.png") is None
+    assert logo_probe.probe_url("http://127.0.0.1:1/refused.png") is None
+
+
+def test_errors_are_probed_once_and_not_cached_as_dead(server):
+    base, httpd = server
+    assert logo_probe.first_live_url([f"{base}/error.png", f"{base}/gone.png"]) is None
+    assert httpd.hits.count("/error.png") == 1
+    assert f"{base}/gone.png" in logo_probe.dead_urls
+    assert f"{base}/error.png" not in logo_probe.dead_urls
+    assert logo_probe.first_live_url([f"{base}/gone.png"]) == ""
+
+
+def test_inconclusive_logo_is_not_stored(server, monkeypatch):
+    monkeypatch.setattr(main, "first_live_url", lambda urls: None)
+    team = {"idTeam": "999001", "strTeam": "Nowhere Rovers", "strLeague": "Nowhere League"}
+    assert main.resolve_team_logo(team) == ""
+    assert logo_store.get_logo("999001") is None
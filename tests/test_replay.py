@@ -0,0 +1,70 @@
+"""Team lookups and the local store, served from recorded TheSportsDB fixtures"""
+import pytest
+
+import main
+import http_client
+import http_replay
+import sports_db
+import team_store
+
+ARSENAL_ID = "133604"
+EPL_ID = "4328"
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    main.sportsdb_cache.clear()
+    sports_db.clear()
+    team_store.clear()
+
+
+def test_team_details_from_fixture():
+    details = main.get_team_details("Arsenal")
+    assert details["team"] == "Arsenal"
+    assert details["team_id"] == ARSENAL_ID
+    assert details["league"] == "English Premier League"
+
+
+def test_team_is_remembered_after_first_lookup():
+    main.get_team_details("Arsenal")
+    before = http_replay.get_stats()["replayed"]
+    assert main.get_team_details("Gunners")["team_id"] == ARSENAL_ID
+    assert http_replay.get_stats()["replayed"] == before
+
+
+def test_results_and_fixtures_sync_into_store():
+    results = main.get_latest_results(ARSENAL_ID)
+    assert [(r["home_team"], r["home_score"], r["away_score"]) for r in results] == [
+        ("Arsenal", "3", "1"),
+        ("Liverpool", "2", "2"),
+    ]
+    fixtures = main.get_upcoming_matches(ARSENAL_ID)
+    assert [(f["home_team"], f["away_team"]) for f in fixtures] == [("Arsenal", "Everton")]
+
+
+def test_league_standings():
+    standings = main.get_league_standings(EPL_ID)
+    assert [(row["position"], row["team"], row["points"]) for row in standings] == [
+        ("1", "Arsenal", "89"),
+        ("2", "Manchester City", "88"),
+    ]
+
+
+def test_unknown_request_is_not_sent_upstream():
+    before = http_replay.get_stats()["missing"]
+    assert http_client.get(f"{main.SPORTSDB_BASE_URL}/KEY/searchteams.php", params={"t": "Nowhere FC"}).status_code == 404
+    assert http_replay.get_stats()["missing"] == before + 1
+
+
+def test_pool_stats_in_replay_mode():
+    main.get_team_details("Arsenal")
+    stats = http_client.get_pool_stats()
+    assert stats["requests"] >= 1
+    assert stats["connections_opened"] == 0
+
+
+def test_settings_from_conftest_take_effect():
+    assert not main.PREFETCH_ENABLED
+    assert main.start_league_prefetch() is None
+    assert not main.BACKGROUND_REFRESH
+    assert http_replay.HTTP_MODE == "replay"
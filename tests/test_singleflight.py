@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+CALLERS = 8
+
+
+def run_concurrently(flight, fn):
+    """Call flight.do("key", fn) from CALLERS threads that all arrive while the first is in flight"""
+    outcomes = [None] * CALLERS
+    def call(i):
+        try:
+            outcomes[i] = ("ok", flight.do("key", fn))
+        except Exception as e:
+            outcomes[i] = ("error", e)
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_waiters(flight, release):
+    # Let the leader finish only once every other caller is waiting on it
+    while flight.get_stats()["calls"] < CALLERS:
+        threading.Event().wait(0.001)
+    release.set()
+
+
+def test_concurrent_callers_share_one_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        release.wait(5)
+        return object()
+
+    threads, outcomes = run_concurrently(flight, fn)
+    wait_for_waiters(flight, release)
+    for thread in threads:
+        thread.join(5)
+    assert len(executions) == 1
+    assert len({id(result) for status, result in outcomes}) == 1
+    assert flight.get_stats()["coalesced"] == CALLERS - 1
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_callers_share_one_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    threads, outcomes = run_concurrently(flight, fn)
+    wait_for_waiters(flight, release)
+    for thread in threads:
+        thread.join(5)
+    assert len(executions) == 1
+    assert all(status == "error" for status, _ in outcomes)
+    assert len({id(error) for _, error in outcomes}) == 1
+
+
+def test_next_call_after_completion_runs_again():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.get_stats()["executions"] == 3
@@ -0,0 +1,59 @@
+import pytest
+
+import sports_db
+
+TEAM_ID = "133604"
+LEAGUE_ID = "4328"
+
+
+def event(event_id, starts_at, status, home_score=None, away_score=None):
+    return {
+        "idEvent": event_id, "idLeague": LEAGUE_ID, "idHomeTeam": TEAM_ID, "idAwayTeam": "133610",
+        "strHomeTeam": "Arsenal", "strAwayTeam": "Chelsea", "strTimestamp": starts_at, "dateEvent": starts_at[:10],
+        "intHomeScore": home_score, "intAwayScore": away_score, "strStatus": status,
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    sports_db.clear()
+
+
+@pytest.mark.parametrize("status, score, finished", [
+    ("FT", "2", True),
+    ("Match Finished", "2", True),
+    ("AET", "1", True),
+    ("1H", "1", False),
+    ("HT", "0", False),
+    ("NS", None, False),
+    (None, "3", True),   # Older results carry a score but no status
+    (None, None, False),
+])
+def test_is_finished(status, score, finished):
+    assert sports_db.is_finished({"strStatus": status, "intHomeScore": score}) is finished
+
+
+def test_in_play_match_is_not_a_result():
+    sports_db.save_events([
+        event("1", "2024-05-04T15:00:00", "FT", "3", "1"),
+        event("2", "2024-05-11T15:00:00", "1H", "1", "0"),
+    ])
+    assert [(r["home_score"], r["away_score"]) for r in sports_db.latest_results(TEAM_ID)] == [("3", "1")]
+    assert sports_db.league_watermark(LEAGUE_ID) == "2024-05-04T15:00:00"
+    assert sports_db.team_event_bounds(TEAM_ID) == ("2024-05-04T15:00:00", "2024-05-11T15:00:00")
+
+
+def test_scored_match_in_play_keeps_live_polling():
+    import time
+    import main
+
+    now = time.time()
+    kickoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now - 1800))
+    sports_db.save_events([event("3", kickoff, "1H", "1", "0")])
+    watermark, next_start = sports_db.team_event_bounds(TEAM_ID)
+    assert next_start == kickoff
+    assert main.next_team_sync_at(next_start, now) == now + main.LIVE_POLL_INTERVAL
+
+    sports_db.save_events([event("3", kickoff, "FT", "2", "0")])
+    watermark, next_start = sports_db.team_event_bounds(TEAM_ID)
+    assert (watermark, next_start) == (kickoff, "")
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the time the cache sees"""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("short", 1, ttl=5)
+    cache.set("default", 2)
+    clock[0] += 6
+    assert cache.get("short") is None
+    assert cache.get("default") == 2
+    clock[0] += 5
+    assert cache.get("default") is None
+    assert cache.get_stats()["expired"] == 2
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = TTLCache(max_entries=3)
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a")  # b is now the least recently used
+    cache.set("d", "d")
+    assert "b" not in cache
+    assert [key for key in "acd" if key in cache] == ["a", "c", "d"]
+    cache.set("e", "e")
+    assert "c" not in cache
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_byte_bound_evicts_oldest(clock):
+    cache = TTLCache(max_entries=100, max_bytes=50)
+    cache.set("a", "x" * 20)
+    cache.set("b", "x" * 20)
+    cache.set("c", "x" * 20)
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.get_stats()["bytes"] <= 50
+
+
+def test_saved_entries_reload_without_expired_ones(clock, tmp_path):
+    path = os.path.join(tmp_path, "cache.json")
+    cache = TTLCache(path=path, default_ttl=60)
+    cache.set("kept", {"teams": [1]})
+    cache.set("expiring", 1, ttl=5)
+    cache.save()
+    clock[0] += 10
+    reloaded = TTLCache(path=path)
+    assert reloaded.get("kept") == {"teams": [1]}
+    assert "expiring" not in reloaded
@@ -0,0 +1,266 @@
+"""Lightweight per-query tracing and Prometheus metrics for upstream and LLM calls.
+
+Each user query runs inside trace_query(), which gives it a trace id. Every
+HTTP request (http_client) and LLM call (llm_client) made while answering it
+is recorded as a timed span with its endpoint, status and size. Spans are
+also aggregated into histograms that export_prometheus() renders in the
+Prometheus text format, served on SPORTSCHAT_METRICS_PORT and/or written to
+SPORTSCHAT_METRICS_FILE when those are set.
+"""
+import os
+import time
+import uuid
+import atexit
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+METRICS_PORT = int(os.getenv("SPORTSCHAT_METRICS_PORT", "0"))   # 0 = no metrics endpoint
+METRICS_FILE = os.getenv("SPORTSCHAT_METRICS_FILE", "")         # "" = don't write a metrics file
+MAX_SPANS_PER_TRACE = 500
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+current_trace = ContextVar("current_trace", default=None)
+
+_metrics_lock = threading.Lock()
+_durations = {}     # (kind, endpoint) -> histogram
+_span_counts = {}   # (kind, endpoint, status) -> count
+_span_bytes = {}    # (kind, endpoint) -> bytes
+_query_durations = None
+_metrics_server = None
+
+
+class Trace:
+    """The spans recorded while answering one user query"""
+
+    def __init__(self, query):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.query = query
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+        self.spans = []
+        self.dropped_spans = 0
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append(span)
+            else:
+                self.dropped_spans += 1
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+        return self.duration
+
+    def to_dict(self):
+        """JSON-friendly view, spans in start order with offsets from the start of the query"""
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._started
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        return {
+            "trace_id": self.trace_id,
+            "query": self.query,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "duration_ms": round(duration * 1000, 1),
+            "spans": spans,
+            "dropped_spans": self.dropped_spans,
+        }
+
+
+@contextmanager
+def trace_query(query):
+    """Trace everything done for one user query in this context (and threads it hands work to)"""
+    trace = Trace(query)
+    token = current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        current_trace.reset(token)
+        _observe_query(trace.finish())
+        if METRICS_FILE:
+            write_metrics()
+
+
+def record_span(kind, endpoint, started, duration, status, size=0, **attrs):
+    """Record a finished call in the metrics and, if a query is being traced, in its trace
+
+    started is a time.perf_counter() value; status is an HTTP status code or a
+    short word such as "ok", "error" or "cancelled".
+    """
+    status = str(status)
+    _observe(kind, endpoint, duration, status, size)
+    trace = current_trace.get()
+    if trace is not None:
+        span = {
+            "kind": kind,
+            "endpoint": endpoint,
+            "status": status,
+            "bytes": size,
+            "start_ms": round((started - trace._started) * 1000, 1),
+            "duration_ms": round(duration * 1000, 1),
+            "thread": threading.current_thread().name,
+        }
+        span.update(attrs)
+        trace.add(span)
+
+
+@contextmanager
+def span(kind, endpoint, **attrs):
+    """Time a block as a span; set "status" and "bytes" on the yielded dict to fill them in"""
+    record = {"status": "ok", "bytes": 0}
+    started = time.perf_counter()
+    try:
+        yield record
+    except GeneratorExit:
+        # A streaming consumer stopped reading
+        record["status"] = "cancelled"
+        raise
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        status = record.pop("status")
+        size = record.pop("bytes")
+        record_span(kind, endpoint, started, time.perf_counter() - started, status, size, **attrs, **record)
+
+
+def _new_histogram():
+    return {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+
+
+def _add_to_histogram(histogram, value):
+    for i, bound in enumerate(BUCKETS):
+        if value <= bound:
+            histogram["buckets"][i] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+
+def _observe(kind, endpoint, duration, status, size):
+    with _metrics_lock:
+        histogram = _durations.get((kind, endpoint))
+        if histogram is None:
+            histogram = _durations[(kind, endpoint)] = _new_histogram()
+        _add_to_histogram(histogram, duration)
+        _span_counts[(kind, endpoint, status)] = _span_counts.get((kind, endpoint, status), 0) + 1
+        _span_bytes[(kind, endpoint)] = _span_bytes.get((kind, endpoint), 0) + size
+
+
+def _observe_query(duration):
+    global _query_durations
+    with _metrics_lock:
+        if _query_durations is None:
+            _query_durations = _new_histogram()
+        _add_to_histogram(_query_durations, duration)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name, histogram, **labels):
+    lines = []
+    for bound, count in zip(BUCKETS, histogram["buckets"]):
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram['count']}")
+    suffix = _labels(**labels) if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram['sum']:.6f}")
+    lines.append(f"{name}_count{suffix} {histogram['count']}")
+    return lines
+
+
+def export_prometheus():
+    """Render all collected metrics in the Prometheus text exposition format"""
+    with _metrics_lock:
+        durations = {key: dict(value, buckets=list(value["buckets"])) for key, value in _durations.items()}
+        counts = dict(_span_counts)
+        sizes = dict(_span_bytes)
+        queries = dict(_query_durations, buckets=list(_query_durations["buckets"])) if _query_durations else None
+
+    lines = [
+        "# HELP sportschat_span_duration_seconds Duration of upstream HTTP and LLM calls",
+        "# TYPE sportschat_span_duration_seconds histogram",
+    ]
+    for (kind, endpoint), histogram in sorted(durations.items()):
+        lines.extend(_histogram_lines("sportschat_span_duration_seconds", histogram, kind=kind, endpoint=endpoint))
+
+    lines += [
+        "# HELP sportschat_spans_total Upstream HTTP and LLM calls by outcome",
+        "# TYPE sportschat_spans_total counter",
+    ]
+    for (kind, endpoint, status), count in sorted(counts.items()):
+        lines.append(f"sportschat_spans_total{_labels(kind=kind, endpoint=endpoint, status=status)} {count}")
+
+    lines += [
+        "# HELP sportschat_span_bytes_total Bytes received from upstream HTTP and LLM calls",
+        "# TYPE sportschat_span_bytes_total counter",
+    ]
+    for (kind, endpoint), size in sorted(sizes.items()):
+        lines.append(f"sportschat_span_bytes_total{_labels(kind=kind, endpoint=endpoint)} {size}")
+
+    lines += [
+        "# HELP sportschat_query_duration_seconds Time to answer a traced user query",
+        "# TYPE sportschat_query_duration_seconds histogram",
+    ]
+    if queries:
+        lines.extend(_histogram_lines("sportschat_query_duration_seconds", queries))
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path=None):
+    """Write the Prometheus metrics to a file (e.g. for node_exporter's textfile collector)"""
+    path = path or METRICS_FILE
+    if not path:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(export_prometheus())
+    os.replace(tmp_path, path)
+
+
+if METRICS_FILE:
+    atexit.register(write_metrics)
+
+
+def start_metrics_server(port=None):
+    """Serve /metrics on localhost from a background thread (once per process); returns the port or None"""
+    global _metrics_server
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+    with _metrics_lock:
+        if _metrics_server is None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def log_message(self, format, *args):
+                    pass
+
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = export_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            _metrics_server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _metrics_server.server_address[1]
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Where on-disk caches and stores live (override in .env if needed)
+CACHE_DIR = os.getenv("SPORTSCHAT_CACHE_DIR", ".sportschat_cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a TTL per entry and an approximate memory bound
+
+    Entries must be JSON-serialisable so the cache can be persisted to disk
+    and reloaded on the next start.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=20 * 1024 * 1024, default_ttl=300, path=None, save_interval=30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.path = path
+        self.save_interval = save_interval
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # One writer of the file at a time, without blocking get()
+        self._dirty = False
+        self._last_save = time.time()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "sets": 0}
+        if path:
+            self.load()
+
+    def get(self, key, default=None):
+        """Return a live value and mark it most recently used"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats["misses"] += 1
+                return default
+            expires_at, size, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting least recently used entries to stay in bounds"""
+        if ttl is None:
+            ttl = self.default_ttl
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.time() + ttl, size, value)
+            self._bytes += size
+            self.stats["sets"] += 1
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+            self._dirty = True
+            save_due = self.path and time.time() - self._last_save >= self.save_interval
+            if save_due:
+                self._last_save = time.time()  # Other setters don't start a save meanwhile
+        # The file is written outside the lock so lookups aren't held up by it
+        if save_due:
+            self.save()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+                self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self._dirty = True
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > time.time()
+
+    def get_stats(self):
+        """Return hit/miss/eviction counters plus current size"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._data)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def save(self):
+        """Write live entries to disk (atomically) in LRU order"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                now = time.time()
+                entries = [[key, expires_at, value] for key, (expires_at, _, value) in self._data.items() if expires_at > now]
+                self._dirty = False
+                self._last_save = now
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+    def load(self):
+        """Reload unexpired entries saved by a previous process"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self._lock:
+            for key, expires_at, value in entries:
+                if expires_at > now:
+                    size = len(json.dumps(value, default=str))
+                    self._data[key] = (expires_at, size, value)
+                    self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+
+    def flush(self):
+        """Save to disk if anything changed since the last save"""
+        if self._dirty:
+            self.save()